@@ -1,4 +1,7 @@
+from .extensions import (AsyncContextExtension, QueryCostExtension, QueryInstrumentationExtension,
+        TransactionExtension)
 from .fields import field, mutation
+from .filter_types import filter
 from .mutations.fields import mutations
 from .mutations.auth import AuthMutation
 from .queries.fields import queries
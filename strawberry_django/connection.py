@@ -0,0 +1,58 @@
+from typing import List, Optional
+import strawberry
+from . import fields, loaders, pagination, utils
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: Optional[str]
+    end_cursor: Optional[str]
+
+
+_connection_types = {}
+
+# generates relay style connection and edge types for object type
+def get_connection_type(object_type):
+    connection_type = _connection_types.get(object_type)
+    if connection_type:
+        return connection_type
+
+    type_name = object_type._type_definition.name
+    edge_type = strawberry.type(type(utils.get_unique_type_name(f'{type_name}Edge'), (), {
+        '__annotations__': { 'node': object_type, 'cursor': str },
+    }))
+
+    # total count is executed only when it is selected in the query
+    def total_count(root) -> int:
+        return root._qs.count()
+
+    connection_type = strawberry.type(type(utils.get_unique_type_name(f'{type_name}Connection'), (), {
+        '__annotations__': { 'edges': List[edge_type], 'page_info': PageInfo },
+        'total_count': fields.field(total_count),
+    }))
+    connection_type._edge_type = edge_type
+    _connection_types[object_type] = connection_type
+    return connection_type
+
+
+# count_qs is the unpaginated queryset which is used to count total number of rows
+def get_connection(connection_type, qs, count_qs, first=None, after=None, last=None, before=None,
+        max_page_size=None):
+    instances, has_more, ordering = pagination.get_page(qs, first, after, last, before,
+            max_page_size=max_page_size)
+    loaders.set_batch(instances)
+
+    edge_type = connection_type._edge_type
+    edges = [edge_type(node=instance, cursor=pagination.get_cursor(instance, ordering))
+            for instance in instances]
+    page_info = PageInfo(
+        has_next_page=has_more and last is None,
+        has_previous_page=has_more and last is not None,
+        start_cursor=edges[0].cursor if edges else None,
+        end_cursor=edges[-1].cursor if edges else None,
+    )
+    connection = connection_type(edges=edges, page_info=page_info)
+    connection._qs = count_qs.order_by()
+    return connection
@@ -0,0 +1,117 @@
+from graphql import (GraphQLInterfaceType, GraphQLList, GraphQLNonNull, GraphQLObjectType,
+        GraphQLUnionType)
+from graphql.execution.values import get_argument_values
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode, OperationType
+from . import pagination, settings, utils
+
+
+# names of the arguments which limit number of returned rows
+PAGE_SIZE_ARGUMENTS = ('first', 'last', 'limit')
+
+
+# number of rows which the query can still resolve. QueryCostExtension sets
+# it before object fields are resolved, None means no limit
+def get_row_budget(info):
+    return utils.get_request_state(info).get('row_budget')
+
+
+def set_row_budget(info, budget):
+    utils.get_request_state(info)['row_budget'] = budget
+
+
+# one row more than the budget is fetched so that exceeding the limit is
+# still detected
+def limit_rows(qs, info):
+    budget = get_row_budget(info)
+    if budget is None:
+        return qs
+    return qs[:budget + 1]
+
+
+def get_page_size_limit(info, max_page_size=None):
+    max_page_size = pagination.get_max_page_size(max_page_size)
+    budget = get_row_budget(info)
+    if budget is None:
+        return max_page_size
+    return budget + 1 if max_page_size is None else min(max_page_size, budget + 1)
+
+
+def get_weight(type_name, weights=None):
+    if weights is None:
+        weights = settings.get('QUERY_COST_WEIGHTS')
+    return weights.get(type_name, 1)
+
+
+# estimated number of rows returned by list field. lists which are not
+# paginated are expected to be as long as the maximum page size
+def get_list_size(page_size=None):
+    list_size = pagination.get_page_size(page_size, pagination.get_max_page_size())
+    if list_size is None:
+        list_size = settings.get('QUERY_COST_LIST_SIZE')
+    return list_size
+
+
+# estimates cost of the operation from its selection set before it is executed.
+# every selected object costs weight of its type multiplied by the estimated
+# number of rows of the lists it is nested in
+def get_query_cost(schema, operation, fragments, variable_values=None, weights=None):
+    if weights is None:
+        weights = settings.get('QUERY_COST_WEIGHTS')
+    root_type = {
+        OperationType.QUERY: schema.query_type,
+        OperationType.MUTATION: schema.mutation_type,
+        OperationType.SUBSCRIPTION: schema.subscription_type,
+    }[operation.operation]
+    context = (schema, fragments, variable_values or {}, weights)
+    return get_selection_set_cost(context, root_type, operation.selection_set)
+
+
+def get_selection_set_cost(context, parent_type, selection_set, page_size=None):
+    schema, fragments, variable_values, weights = context
+    cost = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            field = getattr(parent_type, 'fields', {}).get(selection.name.value)
+            if field:
+                cost += get_field_cost(context, field, selection, page_size)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment:
+                fragment_type = schema.get_type(fragment.type_condition.name.value)
+                cost += get_selection_set_cost(context, fragment_type, fragment.selection_set, page_size)
+        elif isinstance(selection, InlineFragmentNode):
+            fragment_type = parent_type
+            if selection.type_condition:
+                fragment_type = schema.get_type(selection.type_condition.name.value)
+            cost += get_selection_set_cost(context, fragment_type, selection.selection_set, page_size)
+    return cost
+
+
+# page size of a field which is not a list, for example a connection, applies
+# to the lists which are selected inside it
+def get_field_cost(context, field, field_node, page_size=None):
+    schema, fragments, variable_values, weights = context
+    field_type, is_list = unwrap_type(field.type)
+    if not field_node.selection_set or not isinstance(field_type,
+            (GraphQLObjectType, GraphQLInterfaceType, GraphQLUnionType)):
+        return 0
+
+    arguments = get_argument_values(field, field_node, variable_values)
+    size = next((arguments[name] for name in PAGE_SIZE_ARGUMENTS
+            if arguments.get(name) is not None), None)
+    if is_list:
+        rows = get_list_size(size if size is not None else page_size)
+        size = None
+    else:
+        rows = 1
+    weight = get_weight(field_type.name, weights)
+    return rows * (weight + get_selection_set_cost(context, field_type, field_node.selection_set, size))
+
+
+def unwrap_type(field_type):
+    is_list = False
+    while isinstance(field_type, (GraphQLList, GraphQLNonNull)):
+        if isinstance(field_type, GraphQLList):
+            is_list = True
+        field_type = field_type.of_type
+    return field_type, is_list
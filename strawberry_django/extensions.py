@@ -0,0 +1,289 @@
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.backends.signals import connection_created
+from graphql import (GraphQLIncludeDirective, GraphQLInterfaceType, GraphQLObjectType,
+        GraphQLSkipDirective, GraphQLUnionType, OperationType)
+from graphql.execution.values import get_directive_values
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from strawberry.extensions import Extension
+import contextvars
+import inspect
+import time
+import types
+from . import cost, settings, transactions, utils
+
+
+# detects once per execution if the schema is executed in async context.
+# without the extension the context is detected on every resolver call
+class AsyncContextExtension(Extension):
+    def on_request_start(self, *, execution_context):
+        self.token = utils.set_async(utils.detect_async())
+
+    def on_request_end(self, *, execution_context):
+        utils.reset_async(self.token)
+
+
+# rejects queries whose estimated cost exceeds MAX_QUERY_COST before root
+# resolvers are called and stops resolving objects when the query has
+# resolved more than MAX_ROWS model instances. root lists fetch at most one
+# row more than the remaining budget, prefetched relations are only counted
+class QueryCostExtension(Extension):
+    max_cost = None
+    max_rows = None
+
+    def on_request_start(self, *, execution_context):
+        self.cost_limit = self.max_cost
+        if self.cost_limit is None:
+            self.cost_limit = settings.get('MAX_QUERY_COST')
+        self.row_limit = self.max_rows
+        if self.row_limit is None:
+            self.row_limit = settings.get('MAX_ROWS')
+        self.cost = None
+        self.rows = 0
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if info.path.prev is None:
+            self.check_cost(info)
+
+        # only resolvers of object fields query the database
+        return_type, is_list = cost.unwrap_type(info.return_type)
+        if not isinstance(return_type, (GraphQLObjectType, GraphQLInterfaceType, GraphQLUnionType)):
+            return _next(root, info, *args, **kwargs)
+        self.check_rows()
+        # only root lists are limited by the budget
+        if self.row_limit is not None and info.path.prev is None:
+            cost.set_row_budget(info, self.row_limit - self.rows)
+        result = _next(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            return self.count_rows_async(result)
+        return self.count_rows(result)
+
+    def check_cost(self, info):
+        if self.cost is None:
+            self.cost = cost.get_query_cost(info.schema, info.operation, info.fragments,
+                    info.variable_values)
+        if self.cost_limit is not None and self.cost > self.cost_limit:
+            raise ValueError(f'Query cost {self.cost} exceeds maximum cost {self.cost_limit}')
+
+    def check_rows(self):
+        if self.row_limit is not None and self.rows > self.row_limit:
+            raise ValueError(f'Query exceeds maximum number of rows {self.row_limit}')
+
+    def count_rows(self, result):
+        if isinstance(result, types.GeneratorType):
+            return self.count_streamed_rows(result)
+        if isinstance(result, models.Model):
+            self.rows += 1
+        elif isinstance(result, list):
+            self.rows += sum(isinstance(item, models.Model) for item in result)
+        else:
+            return result
+        self.check_rows()
+        return result
+
+    async def count_rows_async(self, result):
+        return self.count_rows(await result)
+
+    # streamed rows are counted when they are fetched
+    def count_streamed_rows(self, result):
+        for item in result:
+            if isinstance(item, models.Model):
+                self.rows += 1
+                self.check_rows()
+            yield item
+
+    def get_results(self):
+        return { 'cost': { 'estimated': self.cost, 'rows': self.rows } }
+
+
+# executes all mutations of an operation in one transaction when transaction
+# scope is 'operation' and reports timings of committed mutation transactions.
+# the transaction is committed after the last mutation, so commit errors are
+# reported as errors of the last mutation. in async context mutations are
+# executed in their own transactions, because the transaction of the
+# operation could not be closed in the thread which has opened it.
+# on_commit can be overridden to send timings elsewhere
+class TransactionExtension(Extension):
+    scope = None
+    using = None
+    isolation_level = None
+    synchronous_commit = None
+
+    def on_request_start(self, *, execution_context):
+        self.transaction_scope = self.scope
+        if self.transaction_scope is None:
+            self.transaction_scope = settings.get('MUTATION_TRANSACTION')
+        self.commits = []
+        self.block = None
+        self.error = None
+        self.hook_token = transactions._commit_hook.set(self.on_commit)
+
+    # transaction is still open when the execution is stopped before the
+    # last mutation, for example by an error of a non-null mutation
+    def on_request_end(self, *, execution_context):
+        try:
+            if self.block is not None:
+                self.end()
+        finally:
+            transactions._commit_hook.reset(self.hook_token)
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if info.path.prev is not None or info.operation.operation != OperationType.MUTATION:
+            return _next(root, info, *args, **kwargs)
+        if self.block is None and self.transaction_scope == 'operation' and not utils.is_async():
+            self.begin(info)
+        if self.block is None:
+            return _next(root, info, *args, **kwargs)
+        try:
+            # mutations after a failed mutation would be rolled back
+            if self.error is not None:
+                raise ValueError('Mutation was not executed because previous mutation of the operation failed')
+            try:
+                return _next(root, info, *args, **kwargs)
+            except Exception as error:
+                self.error = error
+                transaction.set_rollback(True, using=self.block_using)
+                raise
+        finally:
+            if info.path.key == self.last_key:
+                self.end()
+
+    def begin(self, info):
+        self.block_using = self.using or DEFAULT_DB_ALIAS
+        self.last_key = get_root_keys(info)[-1]
+        self.block = transactions.atomic_block(None, self.block_using,
+                self.isolation_level, self.synchronous_commit)
+        self.block.__enter__()
+        self.using_token = transactions._operation_using.set(self.block_using)
+
+    # failed transaction is exited with the error of the failed mutation.
+    # context variable is reset also when the commit fails
+    def end(self):
+        block, self.block = self.block, None
+        try:
+            if self.error is None:
+                block.__exit__(None, None, None)
+            else:
+                block.__exit__(type(self.error), self.error, self.error.__traceback__)
+        finally:
+            transactions._operation_using.reset(self.using_token)
+
+    def on_commit(self, path, using, duration, commit_duration):
+        self.commits.append({ 'path': path, 'database': using,
+                'duration': duration, 'commitDuration': commit_duration })
+
+    def get_results(self):
+        return { 'transactions': self.commits }
+
+
+# response keys of the root fields which are executed, in the order in which
+# mutations are executed
+def get_root_keys(info):
+    keys = []
+    collect_keys(info, info.operation.selection_set, keys)
+    return keys
+
+
+def collect_keys(info, selection_set, keys):
+    for selection in selection_set.selections:
+        if not should_include(info, selection):
+            continue
+        if isinstance(selection, FieldNode):
+            key = selection.alias.value if selection.alias else selection.name.value
+            if key not in keys:
+                keys.append(key)
+        elif isinstance(selection, FragmentSpreadNode):
+            collect_keys(info, info.fragments[selection.name.value].selection_set, keys)
+        elif isinstance(selection, InlineFragmentNode):
+            collect_keys(info, selection.selection_set, keys)
+
+
+def should_include(info, node):
+    skip = get_directive_values(GraphQLSkipDirective, node, info.variable_values)
+    if skip and skip['if']:
+        return False
+    include = get_directive_values(GraphQLIncludeDirective, node, info.variable_values)
+    return not include or include['if']
+
+
+# queries of the current execution and path of the resolver which is being
+# executed. context variables are copied to sync_to_async threads
+_query_log = contextvars.ContextVar('strawberry_django_query_log', default=None)
+_resolver_path = contextvars.ContextVar('strawberry_django_resolver_path', default=None)
+
+
+# reports database queries of the execution in the response extensions.
+# queries are grouped by resolver path without list indexes and identical
+# queries repeated by the same resolver path are reported as probable n+1
+class QueryInstrumentationExtension(Extension):
+    n_plus_one_threshold = None
+
+    def on_request_start(self, *, execution_context):
+        install_query_logger()
+        self.queries = []
+        self.token = _query_log.set(self.queries)
+
+    def on_request_end(self, *, execution_context):
+        _query_log.reset(self.token)
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        path = '.'.join(str(key) for key in info.path.as_list() if isinstance(key, str))
+        token = _resolver_path.set(path)
+        try:
+            result = _next(root, info, *args, **kwargs)
+        finally:
+            _resolver_path.reset(token)
+        if inspect.isawaitable(result):
+            return resolve_async(result, path)
+        return result
+
+    def get_results(self):
+        threshold = self.n_plus_one_threshold
+        if threshold is None:
+            threshold = settings.get('N_PLUS_ONE_THRESHOLD')
+
+        resolvers, shapes = {}, {}
+        for path, sql, duration in self.queries:
+            resolver = resolvers.setdefault(path, { 'path': path, 'count': 0, 'duration': 0 })
+            resolver['count'] += 1
+            resolver['duration'] += duration
+            shapes[path, sql] = shapes.get((path, sql), 0) + 1
+
+        return { 'queries': {
+            'count': len(self.queries),
+            'duration': sum(duration for path, sql, duration in self.queries),
+            'resolvers': list(resolvers.values()),
+            'nPlusOne': [{ 'path': path, 'sql': sql, 'count': count }
+                    for (path, sql), count in shapes.items() if count >= threshold],
+        }}
+
+
+async def resolve_async(result, path):
+    token = _resolver_path.set(path)
+    try:
+        return await result
+    finally:
+        _resolver_path.reset(token)
+
+
+def log_query(execute, sql, params, many, context):
+    queries = _query_log.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries.append((_resolver_path.get(), sql, time.perf_counter() - start))
+
+
+# query logger is added to connections of the current thread and to all
+# connections which are opened later, it does nothing outside executions
+def install_query_logger():
+    connection_created.connect(add_query_logger, dispatch_uid='strawberry_django_query_logger')
+    for connection in connections.all():
+        add_query_logger(connection=connection)
+
+
+def add_query_logger(connection, **kwargs):
+    if log_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_query)
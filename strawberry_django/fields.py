@@ -1,4 +1,5 @@
 import strawberry
+from strawberry.types.fields.resolver import StrawberryResolver
 from typing import Callable, List, Optional, Dict
 import dataclasses
 from . import utils, queries
@@ -10,13 +11,29 @@ class DjangoField:
     kwargs: dict
 
     def resolve(self, is_relation, is_m2m):
-        resolver = queries.resolvers.get_resolver(self.resolver, self.field_name, is_relation, is_m2m)
+        if is_relation and not self.resolver:
+            resolver = get_relation_resolver(self.field_name, is_m2m)
+        else:
+            resolver = queries.resolvers.get_resolver(self.resolver, self.field_name, is_relation, is_m2m)
         field = strawberry.field(resolver, **self.kwargs)
         # workaround for forward reference resolution issue
         field._field_definition.origin = None
         return field
 
 
+_relation_resolvers = {}
+
+# generated relation resolvers are shared by the fields which have the same
+# name, arguments of the resolver are inspected only once
+def get_relation_resolver(field_name, is_m2m):
+    key = (field_name, is_m2m)
+    resolver = _relation_resolvers.get(key)
+    if resolver is None:
+        resolver = queries.resolvers.get_resolver(None, field_name, True, is_m2m)
+        resolver = _relation_resolvers[key] = StrawberryResolver(resolver)
+    return resolver
+
+
 def field(resolver=None, field_name=None, **kwargs):
     if resolver:
         resolver = queries.resolvers.get_resolver(resolver)
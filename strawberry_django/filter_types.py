@@ -0,0 +1,174 @@
+from django.db.models import Q
+from strawberry.arguments import UNSET
+from typing import List, Optional
+import datetime, decimal, uuid
+import strawberry
+from . import utils
+from .meta import get_model_meta
+from .types import get_field_type, is_lazy, process_fields, set_lazy_type
+
+
+# python names of the lookup input fields and matching django lookups
+LOOKUPS = {
+    'exact': 'exact',
+    'i_exact': 'iexact',
+    'contains': 'contains',
+    'i_contains': 'icontains',
+    'starts_with': 'startswith',
+    'i_starts_with': 'istartswith',
+    'ends_with': 'endswith',
+    'i_ends_with': 'iendswith',
+    'in_list': 'in',
+    'gt': 'gt',
+    'gte': 'gte',
+    'lt': 'lt',
+    'lte': 'lte',
+    'range': 'range',
+    'is_null': 'isnull',
+}
+
+COMMON_LOOKUPS = ('exact', 'in_list', 'is_null')
+COMPARISON_LOOKUPS = (*COMMON_LOOKUPS, 'gt', 'gte', 'lt', 'lte', 'range')
+STRING_LOOKUPS = (*COMPARISON_LOOKUPS, 'i_exact', 'contains', 'i_contains',
+        'starts_with', 'i_starts_with', 'ends_with', 'i_ends_with')
+
+# scalar name is used as a prefix of the generated lookup input type name
+scalar_lookups = {
+    str: ('String', STRING_LOOKUPS),
+    int: ('Int', COMPARISON_LOOKUPS),
+    float: ('Float', COMPARISON_LOOKUPS),
+    bool: ('Boolean', ('exact', 'is_null')),
+    strawberry.ID: ('ID', COMPARISON_LOOKUPS),
+    datetime.date: ('Date', COMPARISON_LOOKUPS),
+    datetime.datetime: ('DateTime', COMPARISON_LOOKUPS),
+    datetime.time: ('Time', COMPARISON_LOOKUPS),
+    decimal.Decimal: ('Decimal', COMPARISON_LOOKUPS),
+    uuid.UUID: ('UUID', COMMON_LOOKUPS),
+}
+
+
+_lookup_types = {}
+
+def get_lookup_type(field_type):
+    lookup_type = _lookup_types.get(field_type)
+    if lookup_type:
+        return lookup_type
+
+    if field_type not in scalar_lookups:
+        raise TypeError(f"Filtering is not supported for type '{field_type}'")
+    scalar_name, lookup_names = scalar_lookups[field_type]
+    cls = type(utils.get_unique_type_name(f'{scalar_name}FilterLookup'), (), { '__annotations__': {} })
+    for lookup_name in lookup_names:
+        if lookup_name in ('in_list', 'range'):
+            lookup_field_type = List[field_type]
+        elif lookup_name == 'is_null':
+            lookup_field_type = bool
+        else:
+            lookup_field_type = field_type
+        cls.__annotations__[lookup_name] = Optional[lookup_field_type]
+        setattr(cls, lookup_name, UNSET)
+    cls._lookups = { lookup_name: LOOKUPS[lookup_name] for lookup_name in lookup_names }
+    lookup_type = strawberry.input(cls)
+    _lookup_types[field_type] = lookup_type
+    return lookup_type
+
+
+def get_filter_field_type(field):
+    if field.is_relation:
+        return strawberry.ID
+    field_type = get_field_type(field, None, is_input=True)
+    if field_type == Optional[bool]:
+        field_type = bool
+    return field_type
+
+
+# yields field name and lookup type of filterable fields. relation fields
+# are filtered by primary key of the related object
+def get_filter_fields(model, fields):
+    field_names = process_fields(fields, model)
+    for field in get_model_meta(model).fields:
+        if field_names and field.name not in field_names:
+            continue
+        if field.many_to_many or field.one_to_many or not field.concrete:
+            if field.name in field_names:
+                raise TypeError(f"Filtering by field '{field.name}' is not supported")
+            continue
+        try:
+            lookup_type = get_lookup_type(get_filter_field_type(field))
+        except TypeError:
+            if field.name in field_names:
+                raise
+            continue
+        yield field.name, lookup_type
+
+
+def filter(model, *, fields=None, lazy=None, **kwargs):
+    def wrapper(cls):
+        def generate():
+            if not hasattr(cls, '__annotations__'):
+                cls.__annotations__ = {}
+            filter_fields = {}
+            for field_name, lookup_type in get_filter_fields(model, fields):
+                cls.__annotations__[field_name] = Optional[lookup_type]
+                setattr(cls, field_name, UNSET)
+                filter_fields[field_name] = field_name
+            cls.__annotations__['AND'] = Optional[List[cls]]
+            cls.__annotations__['OR'] = Optional[List[cls]]
+            cls.__annotations__['NOT'] = Optional[cls]
+            cls.AND = cls.OR = cls.NOT = UNSET
+            cls._filter_fields = filter_fields
+            return strawberry.input(cls, **kwargs)
+        cls._django_model = model
+        cls._is_filter = True
+        if is_lazy(lazy):
+            return set_lazy_type(cls, generate, kwargs.get('name'), is_input=True)
+        return generate()
+    return wrapper
+
+
+_filter_types = {}
+
+# default filter type of the model which is generated when no filter type
+# has been registered for the model
+def get_filter_type(model):
+    filter_type = _filter_types.get(model)
+    if filter_type:
+        return filter_type
+    cls = type(utils.get_unique_type_name(f'{model._meta.object_name}Filter'), (), {})
+    filter_type = filter(model)(cls)
+    _filter_types[model] = filter_type
+    return filter_type
+
+
+# translates filter input into a single Q object. lookups of one filter are
+# combined with AND, NOT negates nested filter and OR combines nested filters
+def build_q(where):
+    q = Q()
+    for field_name, django_field_name in where._filter_fields.items():
+        lookups = getattr(where, field_name)
+        if lookups is UNSET or lookups is None:
+            continue
+        for lookup_name, django_lookup in lookups._lookups.items():
+            value = getattr(lookups, lookup_name)
+            if value is UNSET or (value is None and django_lookup != 'exact'):
+                continue
+            if django_lookup == 'range' and len(value) != 2:
+                raise ValueError(f"Filter lookup 'range' of field '{field_name}' requires two values")
+            q &= Q(**{f'{django_field_name}__{django_lookup}': value})
+
+    for sub_where in where.AND or []:
+        q &= build_q(sub_where)
+    if where.OR:
+        or_q = Q()
+        for sub_where in where.OR:
+            or_q |= build_q(sub_where)
+        q &= or_q
+    if where.NOT:
+        q &= ~build_q(where.NOT)
+    return q
+
+
+def apply_filter(qs, where):
+    if where is None or where is UNSET:
+        return qs
+    return qs.filter(build_q(where))
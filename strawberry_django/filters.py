@@ -0,0 +1,77 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+import ast
+import functools
+
+
+# number of compiled filter lists kept in memory
+CACHE_SIZE = 1024
+
+
+def parse_value(value):
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise ValueError('Invalid filter value')
+
+
+def parse_filters(filters):
+    filter, exclude = {}, {}
+    for string in filters:
+        try:
+            k, v = string.split('=', 1)
+        except ValueError:
+            raise ValueError(f'Invalid filter "{string}"')
+        if '!' in k:
+            k = k.strip('!')
+            exclude[k] = parse_value(v)
+        else:
+            filter[k] = parse_value(v)
+    return filter, exclude
+
+
+# filter strings are parsed and validated once and the resulting filter and
+# exclude Q objects are cached. clients tend to send the same filters repeatedly
+def compile_filters(model, filters):
+    return _compile_filters(model, tuple(filters))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile_filters(model, filters):
+    filter, exclude = parse_filters(filters)
+    for lookup in (*filter, *exclude):
+        validate_lookup(model, lookup)
+    return Q(**filter), Q(**exclude)
+
+
+# checks that lookup path refers to existing model fields and that the field
+# supports lookups and transforms at the end of the path
+def validate_lookup(model, lookup):
+    opts = model._meta
+    field = None
+    parts = lookup.split('__')
+    for i, part in enumerate(parts):
+        if opts is not None:
+            try:
+                field = opts.pk if part == 'pk' else opts.get_field(part)
+            except FieldDoesNotExist:
+                if field is None:
+                    raise ValueError(f"Django model '{model._meta.object_name}' has no field '{part}'")
+            else:
+                opts = field.related_model._meta if field.is_relation else None
+                continue
+        validate_transforms(model, lookup, field, parts[i:])
+        return
+
+
+# only the first lookup after the field can be validated. output field of a
+# transform is known only when the query is built
+def validate_transforms(model, lookup, field, parts):
+    name = parts[0]
+    get_transform = getattr(field, 'get_transform', lambda name: None)
+    if len(parts) > 1:
+        is_valid = get_transform(name)
+    else:
+        is_valid = field.get_lookup(name) or get_transform(name)
+    if not is_valid:
+        raise ValueError(f"Unsupported lookup '{name}' in filter '{lookup}'")
@@ -17,6 +17,12 @@ def add(**kwargs):
             for hook in field._hooks[hook_name]:
                 caller(hook)
         field._call_hooks = call_hooks
+        # calls hooks with keyword arguments without allocating a caller
+        # function, which matters when hooks are called for every row
+        def run_hooks(hook_name, **kwargs):
+            for hook in field._hooks[hook_name]:
+                hook(**kwargs)
+        field._run_hooks = run_hooks
         return field
     return wrapper
 
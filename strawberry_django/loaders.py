@@ -0,0 +1,393 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch, prefetch_related_objects
+from graphql.language import OperationType
+from strawberry.dataloader import DataLoader
+import collections
+import django
+from . import pagination, settings, utils
+
+
+# prefetch querysets can be sliced since django 4.2
+SLICED_PREFETCH = django.VERSION >= (4, 2)
+
+# querysets support async iteration since django 4.1
+ASYNC_ORM = django.VERSION >= (4, 1)
+
+
+# instances which are resolved by the same list field are siblings. relation
+# fields of siblings are loaded together when one of them is resolved
+def set_batch(instances):
+    for instance in instances:
+        instance._strawberry_django_batch = instances
+
+
+def get_batch(instance):
+    return getattr(instance, '_strawberry_django_batch', [instance])
+
+
+# instances which have been loaded during a query by model and primary key.
+# rows which are referenced from many places are loaded and constructed only
+# once. least recently used instances are dropped when the map is full
+class IdentityMap:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.instances = collections.OrderedDict()
+
+    def get(self, model, pk):
+        key = (model, pk)
+        instance = self.instances.get(key)
+        if instance is not None:
+            self.instances.move_to_end(key)
+        return instance
+
+    # instances of one queryset share deferred fields. instances with deferred
+    # fields would load the missing fields one by one
+    def add(self, instances):
+        if not instances or instances[0].get_deferred_fields():
+            return
+        for instance in instances:
+            key = (type(instance), instance.pk)
+            self.instances[key] = instance
+            self.instances.move_to_end(key)
+        while len(self.instances) > self.max_size:
+            self.instances.popitem(last=False)
+
+
+# identity map is used only by queries, mutations may change loaded rows. map
+# is stored in the state of the execution and it is discarded with the state
+# when the execution ends, so later executions never get its instances
+def get_identity_map(info):
+    if info is None or info.operation.operation != OperationType.QUERY:
+        return None
+    max_size = settings.get('IDENTITY_MAP_SIZE')
+    if not max_size:
+        return None
+    state = utils.get_request_state(info)
+    identity_map = state.get('identity_map')
+    if identity_map is None:
+        identity_map = state['identity_map'] = IdentityMap(max_size)
+    return identity_map
+
+
+# instances of the model which are found from the identity map by primary key
+def get_identities(identity_map, model, pks):
+    if identity_map is None:
+        return {}
+    instances = {}
+    for pk in pks:
+        instance = identity_map.get(model, pk)
+        if instance is not None:
+            instances[pk] = instance
+    return instances
+
+
+def add_identities(identity_map, instances):
+    if identity_map is not None:
+        identity_map.add(instances)
+
+
+def is_foreign_key(field):
+    return field.many_to_one or (field.one_to_one and field.concrete)
+
+
+def load_foreign_key(info, instance, field):
+    if field.is_cached(instance):
+        related_instance = field.get_cached_value(instance)
+        if related_instance is not None and not hasattr(related_instance, '_strawberry_django_batch'):
+            set_related_batch(get_batch(instance), field)
+        return related_instance
+
+    if getattr(instance, field.attname) is None:
+        return None
+
+    if utils.is_async():
+        return load_foreign_key_async(info, instance, field)
+
+    batch = get_batch(instance)
+    load_foreign_keys(batch, field, get_identity_map(info))
+    set_related_batch(batch, field)
+    return field.get_cached_value(instance)
+
+
+async def load_foreign_key_async(info, instance, field):
+    loader = get_foreign_key_loader(info, field)
+    related_instance = await loader.load(getattr(instance, field.attname))
+    field.set_cached_value(instance, related_instance)
+    return related_instance
+
+
+# one data loader per request for each related model and foreign key
+def get_foreign_key_loader(info, field):
+    loaders = utils.get_request_state(info).setdefault('loaders', {})
+    key = (field.related_model, field.attname)
+    loader = loaders.get(key)
+    if loader is None:
+        identity_map = get_identity_map(info)
+        async def load_fn(values):
+            related_instances = get_known_instances(field, values, identity_map)
+            missing_values = [value for value in values if value not in related_instances]
+            if missing_values and ASYNC_ORM:
+                related_instances.update(await fetch_related_instances_async(field, missing_values))
+            elif missing_values:
+                related_instances.update(await sync_to_async(fetch_related_instances, thread_sensitive=True)(
+                        field, missing_values))
+            add_identities(identity_map, list(related_instances.values()))
+            return [related_instances.get(value) for value in values]
+        loader = loaders[key] = DataLoader(load_fn=load_fn)
+    return loader
+
+
+def load_foreign_keys(instances, field, identity_map=None):
+    instances = [instance for instance in instances if not field.is_cached(instance)]
+    values = {getattr(instance, field.attname) for instance in instances}
+    values.discard(None)
+    related_instances = get_known_instances(field, values, identity_map)
+    values.difference_update(related_instances)
+    if values:
+        related_instances.update(fetch_related_instances(field, values))
+    add_identities(identity_map, list(related_instances.values()))
+    for instance in instances:
+        related_instance = related_instances.get(getattr(instance, field.attname))
+        field.set_cached_value(instance, related_instance)
+
+
+def get_known_instances(field, values, identity_map):
+    if not field.target_field.primary_key:
+        return {}
+    return get_identities(identity_map, field.related_model, values)
+
+
+def fetch_related_instances(field, values):
+    attname = field.target_field.attname
+    return {getattr(instance, attname): instance for instance in get_related_queryset(field, values)}
+
+
+async def fetch_related_instances_async(field, values):
+    attname = field.target_field.attname
+    return {getattr(instance, attname): instance async for instance in get_related_queryset(field, values)}
+
+
+def get_related_queryset(field, values):
+    return field.related_model._base_manager.filter(**{f'{field.target_field.name}__in': values})
+
+
+def set_related_batch(instances, field):
+    related_instances = {}
+    for instance in instances:
+        if field.is_cached(instance):
+            related_instance = field.get_cached_value(instance)
+            if related_instance is not None:
+                related_instances[id(related_instance)] = related_instance
+    set_batch(list(related_instances.values()))
+
+
+# objects which are selected by primary key are loaded with one query. ids
+# which are not found or are not valid primary keys are returned as None
+def fetch_objects(qs, ids, identity_map=None):
+    pks, objects, missing_pks = get_missing_objects(qs, ids, identity_map)
+    instances = []
+    for chunk in utils.chunk_params(missing_pks, qs.db):
+        instances.extend(qs.filter(pk__in=chunk))
+    return map_objects(pks, objects, instances, identity_map)
+
+
+async def fetch_objects_async(qs, ids, identity_map=None):
+    pks, objects, missing_pks = get_missing_objects(qs, ids, identity_map)
+    instances = []
+    for chunk in utils.chunk_params(missing_pks, qs.db):
+        instances.extend([instance async for instance in qs.filter(pk__in=chunk)])
+    return map_objects(pks, objects, instances, identity_map)
+
+
+def get_missing_objects(qs, ids, identity_map):
+    pks = [get_valid_pk(qs.model, id) for id in ids]
+    valid_pks = [pk for pk in dict.fromkeys(pks) if pk is not None]
+    objects = get_identities(identity_map, qs.model, valid_pks)
+    missing_pks = [pk for pk in valid_pks if pk not in objects]
+    return pks, objects, missing_pks
+
+
+# converts id to the primary key value. error message is the same as django
+# gives when objects are filtered with the invalid id
+def to_pk(model, id):
+    pk = model._meta.pk
+    try:
+        return pk.to_python(pk.get_prep_value(id))
+    except ValidationError as error:
+        raise ValueError(' '.join(error.messages))
+    except TypeError as error:
+        raise ValueError(str(error))
+
+
+def get_valid_pk(model, id):
+    try:
+        return to_pk(model, id)
+    except ValueError:
+        return None
+
+
+def map_objects(pks, objects, instances, identity_map):
+    set_batch(instances)
+    add_identities(identity_map, instances)
+    objects.update((instance.pk, instance) for instance in instances)
+    return [objects.get(pk) for pk in pks]
+
+
+# one data loader per request for each object field. object fields which are
+# resolved concurrently are loaded with one query
+def get_object_loader(info, get_queryset):
+    loaders = utils.get_request_state(info).setdefault('loaders', {})
+    key = (info.parent_type.name, info.field_name)
+    loader = loaders.get(key)
+    if loader is None:
+        qs = get_queryset(info)
+        identity_map = get_identity_map(info)
+        async def load_fn(ids):
+            if ASYNC_ORM:
+                return await fetch_objects_async(qs, ids, identity_map)
+            return await sync_to_async(fetch_objects, thread_sensitive=True)(qs, ids, identity_map)
+        loader = loaders[key] = DataLoader(load_fn=load_fn)
+    return loader
+
+
+def is_many(field):
+    return field.many_to_many or field.one_to_many
+
+
+# many-to-many and reverse foreign key relations of sibling instances which
+# share the same field arguments are loaded with one prefetch query
+def load_many(info, instance, field, filters=None, order_by=None, pagination_args=None):
+    if pagination.is_paginated(pagination_args) and not SLICED_PREFETCH:
+        return load_page(instance, field, filters, order_by, pagination_args)
+
+    to_attr = get_prefetch_attr(info, field.name, filters, order_by, pagination_args)
+    if hasattr(instance, to_attr):
+        related_instances = getattr(instance, to_attr)
+        if related_instances and not hasattr(related_instances[0], '_strawberry_django_batch'):
+            set_many_batch(get_batch(instance), to_attr)
+        return limit_page(related_instances, pagination_args)
+
+    if utils.is_async():
+        return load_many_async(info, instance, field, filters, order_by, pagination_args, to_attr)
+
+    batch = [instance for instance in get_batch(instance) if not hasattr(instance, to_attr)]
+    prefetch_many(batch, field, filters, order_by, pagination_args, to_attr, get_identity_map(info))
+    return limit_page(getattr(instance, to_attr), pagination_args)
+
+
+async def load_many_async(info, instance, field, filters, order_by, pagination_args, to_attr):
+    loader = get_many_loader(info, field, filters, order_by, pagination_args, to_attr)
+    related_instances = await loader.load(instance)
+    setattr(instance, to_attr, related_instances)
+    return limit_page(related_instances, pagination_args)
+
+
+def get_many_loader(info, field, filters, order_by, pagination_args, to_attr):
+    loaders = utils.get_request_state(info).setdefault('loaders', {})
+    key = (field.model, to_attr)
+    loader = loaders.get(key)
+    if loader is None:
+        identity_map = get_identity_map(info)
+        async def load_fn(instances):
+            await sync_to_async(prefetch_many, thread_sensitive=True)(
+                    instances, field, filters, order_by, pagination_args, to_attr, identity_map)
+            return [getattr(instance, to_attr) for instance in instances]
+        loader = loaders[key] = DataLoader(load_fn=load_fn)
+    return loader
+
+
+def prefetch_many(instances, field, filters, order_by, pagination_args, to_attr, identity_map=None):
+    qs = utils.apply_filters(field.related_model.objects.all(), filters, order_by)
+    reverse = False
+    if pagination.is_paginated(pagination_args):
+        qs, reverse = pagination.paginate(qs, **pagination_args)
+    prefetch = Prefetch(get_accessor_name(field), queryset=qs, to_attr=to_attr)
+    prefetch_related_objects(instances, prefetch)
+    if reverse:
+        for instance in instances:
+            setattr(instance, to_attr, getattr(instance, to_attr)[::-1])
+    add_identities(identity_map, set_many_batch(instances, to_attr))
+
+
+# unpaginated relations are loaded in one query and limited to maximum page
+# size afterwards, because older django versions do not support sliced prefetch
+def limit_page(related_instances, pagination_args):
+    max_page_size = pagination.get_max_page_size()
+    if max_page_size is None or pagination.is_paginated(pagination_args):
+        return related_instances
+    return related_instances[:max_page_size]
+
+
+# paginated relation is loaded separately for each instance
+def load_page(instance, field, filters, order_by, pagination_args):
+    if utils.is_async():
+        return sync_to_async(fetch_page, thread_sensitive=True)(
+                instance, field, filters, order_by, pagination_args)
+    return fetch_page(instance, field, filters, order_by, pagination_args)
+
+
+def fetch_page(instance, field, filters, order_by, pagination_args):
+    qs = getattr(instance, get_accessor_name(field)).all()
+    qs = utils.apply_filters(qs, filters, order_by)
+    qs, reverse = pagination.paginate(qs, **pagination_args)
+    related_instances = list(qs)
+    if reverse:
+        related_instances.reverse()
+    set_batch(related_instances)
+    return related_instances
+
+
+# yields instances of the queryset without loading all rows to memory. rows
+# are fetched with a server side cursor when database supports it. prefetch
+# lookups are applied to each chunk and instances of a chunk are siblings
+def iterate_chunks(qs, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = settings.get('STREAM_CHUNK_SIZE')
+    lookups = qs._prefetch_related_lookups
+    chunk = []
+    for instance in qs.prefetch_related(None).iterator(chunk_size=chunk_size):
+        chunk.append(instance)
+        if len(chunk) == chunk_size:
+            yield from load_chunk(chunk, lookups)
+            chunk = []
+    if chunk:
+        yield from load_chunk(chunk, lookups)
+
+
+def load_chunk(instances, lookups):
+    if lookups:
+        prefetch_related_objects(instances, *lookups)
+    set_batch(instances)
+    return instances
+
+
+def set_many_batch(instances, to_attr):
+    related_instances = {}
+    for instance in instances:
+        for related_instance in getattr(instance, to_attr, ()):
+            related_instances[id(related_instance)] = related_instance
+    related_instances = list(related_instances.values())
+    set_batch(related_instances)
+    return related_instances
+
+
+def get_accessor_name(field):
+    if field.auto_created and not field.concrete:
+        return field.get_accessor_name()
+    return field.name
+
+
+# prefetched m2m results are stored to instance attribute which name depends on
+# field arguments. that way aliased fields with different arguments do not mix.
+# names are numbered by the full arguments for each request so that they
+# cannot collide
+def get_prefetch_attr(info, field_name, filters, order_by, pagination_args=None):
+    key = (field_name, tuple(filters or ()), tuple(order_by or ()))
+    if pagination.is_paginated(pagination_args):
+        key += tuple(sorted(pagination_args.items()))
+    attrs = utils.get_request_state(info).setdefault('prefetch_attrs', {})
+    attr = attrs.get(key)
+    if attr is None:
+        attr = attrs[key] = f'_prefetched_{field_name}_{len(attrs)}'
+    return attr
@@ -0,0 +1,39 @@
+from django.core.exceptions import FieldDoesNotExist
+import functools
+from . import utils
+
+
+# metadata of a django model which is read repeatedly when types and resolvers
+# are generated and when relation fields are resolved. model fields do not
+# change after django apps have been loaded, so metadata is computed once
+@functools.lru_cache(maxsize=None)
+def get_model_meta(model):
+    return ModelMeta(model)
+
+
+class ModelMeta:
+    def __init__(self, model):
+        self.model = model
+        self.object_name = model._meta.object_name
+        self.snake_name = utils.camel_to_snake(self.object_name)
+        self.fields = tuple(model._meta.get_fields())
+        self.field_names = frozenset(field.name for field in self.fields)
+        self.many_field_names = frozenset(field.name for field in self.fields
+                if field.many_to_many or field.one_to_many)
+        self.field_cache = {}
+
+    # returns None instead of raising an error when model has no such field
+    def get_field(self, field_name):
+        try:
+            return self.field_cache[field_name]
+        except KeyError:
+            pass
+        try:
+            field = self.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+        self.field_cache[field_name] = field
+        return field
+
+    def is_many(self, field_name):
+        return field_name in self.many_field_names
@@ -1,19 +1,27 @@
 import strawberry
 from . import resolvers
-from .. import utils
+from ..meta import get_model_meta
 from ..queries.arguments import resolve_type_args
 
 
+_mutation_types = {}
+
+# mutation type is cached by the resolved types like the query type
 def mutations(*args, types=None):
-    type_args = resolve_type_args(args, types=types, is_input=True)
+    type_args = tuple(resolve_type_args(args, types=types, is_input=True))
+    mutation_type = _mutation_types.get(type_args)
+    if mutation_type:
+        return mutation_type
     mutation_fields = {}
     for model, output_type, input_type in type_args:
-        object_name = utils.camel_to_snake(model._meta.object_name)
+        object_name = get_model_meta(model).snake_name
         mutation_fields[f'create_{object_name}'] = resolvers.create(model, output_type, input_type)
         mutation_fields[f'create_{object_name}s'] = resolvers.create_batch(model, output_type, input_type)
         mutation_fields[f'update_{object_name}s'] = resolvers.update(model, output_type, input_type)
         mutation_fields[f'delete_{object_name}s'] = resolvers.delete(model, output_type, input_type)
-    return strawberry.type(type('Mutation', (), mutation_fields))
+    mutation_type = strawberry.type(type('Mutation', (), mutation_fields))
+    _mutation_types[type_args] = mutation_type
+    return mutation_type
 
 mutations.create = resolvers.create
 mutations.create_batch = resolvers.create_batch
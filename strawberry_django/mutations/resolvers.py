@@ -1,11 +1,15 @@
+from django.db import connections, models, router, transaction
+from django.db.models.deletion import Collector
+from django.db.models.signals import m2m_changed
 from typing import List, Optional
 import strawberry
-from .. import fields, hooks, utils
+from .. import fields, hooks, optimizer, settings, transactions, utils
 from ..type import generate_update_from_input
 from ..queries.arguments import resolve_type_args
 from ..resolvers import django_resolver
 
-def create(*args, types=None, pre_save=None, post_save=None):
+def create(*args, types=None, pre_save=None, post_save=None, atomic=None, isolation_level=None,
+        synchronous_commit=None):
     model, output_type, input_type = resolve_type_args(args, types=types, is_input=True, single=True)
     @hooks.add(pre_save=pre_save, post_save=post_save)
     @strawberry.mutation
@@ -15,75 +19,308 @@ def create(*args, types=None, pre_save=None, post_save=None):
         instance = model(**instance_data)
         def caller(hook):
             hook(info, instance)
-        mutation._call_hooks('pre_save', caller)
-        instance.save()
-        update_m2m_fields(model, [instance], data)
-        mutation._call_hooks('post_save', caller)
+        db = router.db_for_write(model)
+        with transactions.mutation_atomic(info, db, atomic, isolation_level, synchronous_commit):
+            mutation._call_hooks('pre_save', caller)
+            instance.save(using=db)
+            update_m2m_fields(model, [instance], data)
+            mutation._call_hooks('post_save', caller)
         return instance
     return mutation
 
-def create_batch(*args, types=None, pre_save=None, post_save=None):
+# rows are created in one transaction by default. bulk mode always uses
+# a transaction so that rows and many-to-many relations are created together
+def create_batch(*args, types=None, pre_save=None, post_save=None, pre_save_batch=None,
+        post_save_batch=None, bulk=None, batch_size=None, atomic=None, isolation_level=None,
+        synchronous_commit=None):
     model, output_type, input_type = resolve_type_args(args, types=types, is_input=True, single=True)
-    @hooks.add(pre_save=pre_save, post_save=post_save)
+    @hooks.add(pre_save=pre_save, post_save=post_save,
+            pre_save_batch=pre_save_batch, post_save_batch=post_save_batch)
     @strawberry.mutation
     @django_resolver
-    def mutation(data: List[input_type]) -> List[output_type]:
-        instances = []
-        for d in data:
-            instance_data = utils.get_input_data(model, d)
-            instance = model(**instance_data)
-            def caller(hook):
-                hook(info=info, instance=instance)
-            mutation._call_hooks('pre_save', caller)
-            instance.save()
-            update_m2m_fields(model, [instance], data)
-            mutation._call_hooks('post_save', caller)
-            instances.append(instance)
+    def mutation(info, data: List[input_type]) -> List[output_type]:
+        db = router.db_for_write(model)
+        if is_bulk_create(bulk):
+            with transactions.mutation_atomic(info, db, True, isolation_level, synchronous_commit):
+                return bulk_create(info, mutation, model, data, batch_size)
+        instances = [model(**utils.get_input_data(model, d)) for d in data]
+        run_hooks = mutation._run_hooks
+        with transactions.mutation_atomic(info, db, atomic, isolation_level, synchronous_commit):
+            run_hooks('pre_save_batch', info=info, instances=instances)
+            for instance, d in zip(instances, data):
+                run_hooks('pre_save', info=info, instance=instance)
+                instance.save(using=db)
+                update_m2m_fields(model, [instance], d)
+                run_hooks('post_save', info=info, instance=instance)
+            run_hooks('post_save_batch', info=info, instances=instances)
         return instances
     return mutation
 
-def update(*args, types=None):
+def update(*args, types=None, isolation_level=None, synchronous_commit=None):
     model, output_type, input_type = resolve_type_args(args, types=types, is_input=True, single=True)
     update_type = generate_update_from_input(model, input_type)
     @strawberry.mutation
     @django_resolver
-    def mutation(data: update_type, filters: Optional[List[str]] = []) -> List[output_type]:
-        qs = model.objects.all()
-        if filters:
-            filter, exclude = utils.process_filters(filters)
-            qs = qs.filter(**filter).exclude(**exclude)
+    def mutation(info, data: update_type, filters: Optional[List[str]] = []) -> List[output_type]:
+        qs = utils.apply_filters(model.objects.all(), filters)
         update_data = utils.get_input_data(model, data)
-        qs.update(**update_data)
-        update_m2m_fields(model, qs, data)
-        return qs.all()
+        db = router.db_for_write(model)
+        # rows are selected once by primary key so that the update of filtered
+        # columns does not change which rows are updated and returned
+        with transactions.mutation_atomic(info, db, True, isolation_level, synchronous_commit):
+            pks = list(qs.using(db).values_list('pk', flat=True))
+            if update_data:
+                for chunk in utils.chunk_params(pks, db):
+                    model.objects.using(db).filter(pk__in=chunk).update(**update_data)
+            update_m2m_fields(model, None, data, pks=pks)
+        qs = optimizer.optimize(model.objects.using(db), info, output_type)
+        return fetch_by_pks(qs, pks)
     return mutation
 
-def delete(*args, types=None):
+def delete(*args, types=None, chunk_size=None, atomic=None, isolation_level=None, synchronous_commit=None):
     model, output_type, input_type = resolve_type_args(args, types=types, is_input=True, single=True)
     @strawberry.mutation
     @django_resolver
-    def mutation(filters: Optional[List[str]] = []) -> List[strawberry.ID]:
-        qs = model.objects.all()
-        if filters:
-            filter, exclude = utils.process_filters(filters)
-            qs = qs.filter(**filter).exclude(**exclude)
-        ids = list(qs.values_list('id', flat=True))
-        qs.delete()
+    def mutation(info, filters: Optional[List[str]] = []) -> List[strawberry.ID]:
+        qs = utils.apply_filters(model.objects.all(), filters)
+        db = router.db_for_write(model)
+        if Collector(using=db).can_fast_delete(qs):
+            # single delete statement does not need a transaction
+            fast_atomic = atomic
+            if fast_atomic is None and is_single_delete(db, chunk_size):
+                fast_atomic = False
+            with transactions.mutation_atomic(info, db, fast_atomic, isolation_level, synchronous_commit):
+                return fast_delete(qs.using(db), chunk_size)
+        with transactions.mutation_atomic(info, db, atomic, isolation_level, synchronous_commit):
+            ids = list(qs.using(db).values_list('id', flat=True))
+            qs.using(db).delete()
         return ids
     return mutation
 
 
 #internal helpers
 
-def update_m2m_fields(model, objects, data):
+# objects are fetched by primary keys when they are not given
+def update_m2m_fields(model, objects, data, pks=None):
     data = utils.get_input_data_m2m(model, data)
     if not data:
         return
-    # iterate through objects and update m2m fields
+    db = router.db_for_write(model)
+    if pks is not None:
+        pass
+    elif isinstance(objects, models.QuerySet):
+        pks = list(objects.using(db).values_list('pk', flat=True))
+    else:
+        pks = [obj.pk for obj in objects]
+    def get_objects():
+        nonlocal objects
+        if objects is None:
+            objects = fetch_by_pks(model.objects.using(db), pks)
+        return objects
+
+    with transaction.atomic(using=db, savepoint=False):
+        for field_name, actions in data.items():
+            field = model._meta.get_field(field_name)
+            if field.remote_field.through._meta.auto_created:
+                update_m2m_field(field, get_objects, pks, actions, db)
+                continue
+            # iterate through objects and update m2m fields with custom through model
+            for obj in get_objects():
+                relation_field = getattr(obj, field_name)
+                for key, values in actions.items():
+                    # action is add, set or remove function of relation field
+                    action = getattr(relation_field, key)
+                    action(*values)
+
+
+# changes relations of all objects with one delete and one insert to the
+# through table. add, set and remove are applied in this order like they
+# would be applied one after another
+def update_m2m_field(field, get_objects, pks, actions, db):
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    to_python = field.target_field.to_python
+
+    removes = {to_python(value) for value in actions.get('remove', [])}
+    if 'set' in actions:
+        values = actions['set']
+    else:
+        values = actions.get('add', [])
+    adds = [value for value in dict.fromkeys(map(to_python, values)) if value not in removes]
+
+    querysets = []
+    for chunk in utils.chunk_params(pks, db, reserved=len(adds) + len(removes)):
+        rows = through.objects.using(db).filter(**{ f'{source}__in': chunk })
+        if 'set' in actions:
+            deleted_rows = rows.exclude(**{ f'{target}__in': adds })
+        elif removes:
+            deleted_rows = rows.filter(**{ f'{target}__in': removes })
+        else:
+            deleted_rows = None
+        querysets.append((rows, deleted_rows))
+    new_rows = [through(**{ source: pk, target: value }) for pk in pks for value in adds]
+
+    signals = None
+    if settings.get('M2M_CHANGED_SIGNALS'):
+        signals = get_m2m_changed_signals(field, get_objects(), querysets, adds, db)
+        send_m2m_changed_signals(signals, 'pre')
+    for rows, deleted_rows in querysets:
+        if deleted_rows is not None:
+            deleted_rows.delete()
+    through.objects.using(db).bulk_create(new_rows, ignore_conflicts=True)
+    if signals:
+        send_m2m_changed_signals(signals, 'post')
+
+
+# signals are sent for each object with the primary keys which are actually
+# added or removed, this needs to query existing rows of the through table
+def get_m2m_changed_signals(field, objects, querysets, adds, db):
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    existing, removed = {}, {}
+    for rows, deleted_rows in querysets:
+        for pk, value in rows.values_list(source, target):
+            existing.setdefault(pk, set()).add(value)
+        if deleted_rows is not None:
+            for pk, value in deleted_rows.values_list(source, target):
+                removed.setdefault(pk, set()).add(value)
+
+    signals = []
     for obj in objects:
-        for key, actions in data.items():
-            relation_field = getattr(obj, key)
-            for key, values in actions.items():
-                # action is add, set or remove function of relation field
-                action = getattr(relation_field, key)
-                action(*values)
+        kwargs = dict(sender=through, instance=obj, reverse=False,
+                model=field.related_model, using=db)
+        if removed.get(obj.pk):
+            signals.append(('remove', dict(kwargs, pk_set=removed[obj.pk])))
+        added = set(adds) - existing.get(obj.pk, set())
+        if added:
+            signals.append(('add', dict(kwargs, pk_set=added)))
+    return signals
+
+
+def send_m2m_changed_signals(signals, prefix):
+    for action, kwargs in signals:
+        m2m_changed.send(action=f'{prefix}_{action}', **kwargs)
+
+
+# returns instances in the order of primary keys. primary keys are split to
+# chunks which fit to the query parameter limit of the database
+def fetch_by_pks(qs, pks):
+    instances = {}
+    for chunk in utils.chunk_params(pks, qs.db):
+        instances.update(qs.filter(pk__in=chunk).in_bulk())
+    return [instances[pk] for pk in pks if pk in instances]
+
+
+def is_bulk_create(bulk):
+    if bulk is None:
+        bulk = settings.get('BULK_CREATE')
+    return bulk
+
+
+# rows are inserted in the transaction of the mutation. pre_save hooks of all
+# instances are called before the insert and post_save hooks after
+# many-to-many rows have been created. batch hooks are called once around
+# the instance hooks. model save method and signals are not called
+def bulk_create(info, mutation, model, data, batch_size=None):
+    if batch_size is None:
+        batch_size = settings.get('BULK_CREATE_BATCH_SIZE')
+    instances = [model(**utils.get_input_data(model, d)) for d in data]
+    run_hooks = mutation._run_hooks
+    def call_hooks(hook_name):
+        for instance in instances:
+            run_hooks(hook_name, info=info, instance=instance)
+
+    db = router.db_for_write(model)
+    run_hooks('pre_save_batch', info=info, instances=instances)
+    call_hooks('pre_save')
+    if can_bulk_create(model, db):
+        model.objects.using(db).bulk_create(instances, batch_size=batch_size)
+    else:
+        for instance in instances:
+            instance.save(using=db)
+    create_m2m_fields(model, instances, data, db, batch_size)
+    call_hooks('post_save')
+    run_hooks('post_save_batch', info=info, instances=instances)
+    return instances
+
+
+# primary keys of the inserted rows are needed for the response and
+# many-to-many rows. backends which cannot return them save rows one by one
+def can_bulk_create(model, db):
+    features = connections[db].features
+    return features.can_return_rows_from_bulk_insert and not model._meta.parents
+
+
+# creates many-to-many rows of new instances with one insert per field.
+# relations with custom through models are added one instance at a time
+def create_m2m_fields(model, instances, data, db, batch_size=None):
+    through_rows = {}
+    for instance, d in zip(instances, data):
+        for field_name, actions in utils.get_input_data_m2m(model, d).items():
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            values = [*actions.get('set', []), *actions.get('add', [])]
+            if not through._meta.auto_created:
+                getattr(instance, field_name).add(*values)
+                continue
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+            rows = through_rows.setdefault(through, [])
+            for value in dict.fromkeys(values):
+                rows.append(through(**{ source: instance.pk, target: value }))
+    for through, rows in through_rows.items():
+        through.objects.using(db).bulk_create(rows, batch_size=batch_size)
+
+
+# deletes rows of models without cascades and signals without the collector.
+# rows are deleted with DELETE ... RETURNING where backend supports it.
+# chunks keep each statement and its locks small on large deletions
+def get_delete_chunk_size(chunk_size=None):
+    if chunk_size is None:
+        chunk_size = settings.get('DELETE_CHUNK_SIZE')
+    return chunk_size
+
+
+def is_single_delete(db, chunk_size=None):
+    return not get_delete_chunk_size(chunk_size) and can_delete_returning(connections[db])
+
+
+def fast_delete(qs, chunk_size=None):
+    chunk_size = get_delete_chunk_size(chunk_size)
+    qs = qs.order_by()
+    pks = []
+    while True:
+        chunk_qs = qs[:chunk_size] if chunk_size else qs
+        deleted_pks = delete_returning(chunk_qs)
+        pks.extend(deleted_pks)
+        if not chunk_size or len(deleted_pks) < chunk_size:
+            break
+    return sorted(pks)
+
+
+def delete_returning(qs):
+    connection = connections[qs.db]
+    if not can_delete_returning(connection):
+        pks = list(qs.values_list('pk', flat=True))
+        for chunk in utils.chunk_params(pks, qs.db):
+            qs.model.objects.using(qs.db).filter(pk__in=chunk)._raw_delete(qs.db)
+        return pks
+
+    opts = qs.model._meta
+    table = connection.ops.quote_name(opts.db_table)
+    column = connection.ops.quote_name(opts.pk.column)
+    subquery, params = qs.values('pk').query.get_compiler(using=qs.db).as_sql()
+    sql = f'DELETE FROM {table} WHERE {column} IN ({subquery}) RETURNING {column}'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [opts.pk.to_python(row[0]) for row in cursor.fetchall()]
+
+
+def can_delete_returning(connection):
+    if connection.vendor == 'postgresql':
+        return True
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
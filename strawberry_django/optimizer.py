@@ -0,0 +1,167 @@
+from django.db.models import Prefetch
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.utilities import value_from_ast_untyped
+from . import loaders, settings, utils
+from .meta import get_model_meta
+
+
+PAGINATION_ARGUMENTS = ('first', 'after', 'last', 'before', 'offset', 'limit')
+
+
+# optimizer inspects selected fields of the query and applies select_related
+# and prefetch_related to the queryset so that relation fields can be
+# resolved from the cache instead of querying them one instance at a time
+def optimize(qs, info, object_type, field_nodes=None):
+    selected_fields = get_selected_fields(info, field_nodes or info.field_nodes)
+    return optimize_queryset(qs, info, object_type, selected_fields)
+
+
+# connection nodes are selected through edges { node { ... } }
+def optimize_connection(qs, info, object_type):
+    edges = [node for node in get_selected_fields(info, info.field_nodes) if node.name.value == 'edges']
+    nodes = [node for node in get_selected_fields(info, edges) if node.name.value == 'node']
+    selected_fields = get_selected_fields(info, nodes)
+    return optimize_queryset(qs, info, object_type, selected_fields)
+
+
+def optimize_queryset(qs, info, object_type, selected_fields, required_fields=()):
+    select_related, prefetch_related = [], []
+    only = [] if use_only(qs) else None
+    get_lookups(info, object_type, selected_fields, '', select_related, prefetch_related, only)
+    if only:
+        only.extend(required_fields)
+    if select_related:
+        qs = qs.select_related(*select_related)
+    if prefetch_related:
+        qs = qs.prefetch_related(*prefetch_related)
+    if only:
+        qs = qs.only(*only)
+    return qs
+
+
+# column pruning is not used if queryset hooks have already deferred fields
+def use_only(qs):
+    if not settings.get('OPTIMIZER_ONLY_FIELDS'):
+        return False
+    field_names, defer = qs.query.deferred_loading
+    return not field_names and defer
+
+
+# only is None when selected fields of the current level cannot be mapped to
+# model fields, for example when type has custom resolvers. in that case all
+# fields of the level and levels below it are loaded
+def get_lookups(info, object_type, selected_fields, prefix, select_related, prefetch_related, only):
+    model_fields = list(get_model_fields(object_type, selected_fields))
+    if only is not None:
+        if all(django_field for django_field, _, _ in model_fields):
+            only.append(f'{prefix}{object_type._django_model._meta.pk.name}')
+        else:
+            only = None
+
+    for django_field, field_type, field_nodes in model_fields:
+        if django_field is None:
+            continue
+        lookup = f'{prefix}{django_field.name}'
+
+        if not django_field.is_relation:
+            if only is not None:
+                only.append(lookup)
+            continue
+
+        is_m2m = django_field.many_to_many or django_field.one_to_many
+        if not is_m2m and django_field.concrete and only is not None:
+            only.append(lookup)
+
+        if not hasattr(field_type, '_django_model'):
+            continue
+        nested_fields = get_selected_fields(info, field_nodes)
+
+        if not is_m2m:
+            select_related.append(lookup)
+            get_lookups(info, field_type, nested_fields, f'{lookup}__',
+                    select_related, prefetch_related, only)
+            continue
+
+        # paginated relations are loaded by relation resolvers
+        arguments = [get_arguments(info, node) for node in field_nodes if not is_paginated(node)]
+        for filters, order_by in set(arguments):
+            qs = django_field.related_model.objects.all()
+            qs = utils.apply_filters(qs, filters, order_by)
+            # reverse foreign key is needed to map results to parent objects
+            required_fields = [django_field.field.name] if django_field.one_to_many else []
+            qs = optimize_queryset(qs, info, field_type, nested_fields, required_fields)
+            to_attr = loaders.get_prefetch_attr(info, django_field.name, filters, order_by)
+            lookup = f'{prefix}{loaders.get_accessor_name(django_field)}'
+            prefetch_related.append(Prefetch(lookup, queryset=qs, to_attr=to_attr))
+
+
+# yields model field, field type and field nodes of selected fields. model field
+# is None if selected field is not mapped to a model field
+def get_model_fields(object_type, selected_fields):
+    model = object_type._django_model
+    django_fields = getattr(object_type, '_django_fields', {})
+    type_fields = {field.name: field for field in object_type._type_definition.fields}
+
+    nodes = {}
+    for node in selected_fields:
+        if node.name.value.startswith('__'):
+            continue
+        nodes.setdefault(node.name.value, []).append(node)
+
+    for name, field_nodes in nodes.items():
+        type_field = type_fields.get(name)
+        django_field_name = type_field and django_fields.get(type_field.origin_name)
+        if django_field_name is None:
+            yield None, None, field_nodes
+            continue
+        django_field = get_model_meta(model).get_field(django_field_name)
+        yield django_field, get_field_type(type_field), field_nodes
+
+
+def get_field_type(type_field):
+    while type_field.is_list:
+        type_field = type_field.child
+    return type_field.type
+
+
+def get_selected_fields(info, nodes):
+    selected_fields = []
+    for node in nodes:
+        if node.selection_set:
+            collect_fields(info, node.selection_set.selections, selected_fields)
+    return selected_fields
+
+
+# nodes of the fields which are selected with the same name on the same level
+# of the query, for example aliased root fields
+def get_sibling_fields(info):
+    if info.path.prev is not None:
+        return info.field_nodes
+    selected_fields = []
+    collect_fields(info, info.operation.selection_set.selections, selected_fields)
+    return [node for node in selected_fields if node.name.value == info.field_name]
+
+
+def collect_fields(info, selections, selected_fields):
+    for selection in selections:
+        if isinstance(selection, FieldNode):
+            selected_fields.append(selection)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments[selection.name.value]
+            collect_fields(info, fragment.selection_set.selections, selected_fields)
+        elif isinstance(selection, InlineFragmentNode):
+            collect_fields(info, selection.selection_set.selections, selected_fields)
+
+
+def is_paginated(node):
+    return any(argument.name.value in PAGINATION_ARGUMENTS for argument in node.arguments)
+
+
+def get_arguments(info, node):
+    arguments = {}
+    for argument in node.arguments:
+        arguments[argument.name.value] = value_from_ast_untyped(argument.value, info.variable_values)
+    filters = tuple(arguments.get('filters') or ())
+    order_by = tuple(arguments.get('orderBy') or ())
+    return filters, order_by
+
@@ -0,0 +1,174 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import F, Q
+import base64
+import json
+from . import settings
+
+
+def get_arguments(first=None, after=None, last=None, before=None, offset=None, limit=None):
+    return dict(first=first, after=after, last=last, before=before, offset=offset, limit=limit)
+
+
+def is_paginated(pagination):
+    return bool(pagination) and any(value is not None for value in pagination.values())
+
+
+def get_max_page_size(max_page_size=None):
+    if max_page_size is None:
+        max_page_size = settings.get('MAX_PAGE_SIZE')
+    return max_page_size
+
+
+# returns queryset limited to the requested page and boolean which tells if
+# results of the queryset have to be reversed. keyset pagination with cursors
+# filters by the ordering values of the cursor instead of using OFFSET
+def paginate(qs, first=None, after=None, last=None, before=None, offset=None, limit=None,
+        max_page_size=None):
+    max_page_size = get_max_page_size(max_page_size)
+    is_keyset = any(value is not None for value in (first, after, last, before))
+    if is_keyset and (offset is not None or limit is not None):
+        raise ValueError('Cursor and offset pagination cannot be used together')
+    validate(first=first, last=last, offset=offset, limit=limit)
+
+    if not is_keyset:
+        offset = offset or 0
+        limit = get_page_size(limit, max_page_size)
+        if limit is None:
+            return (qs[offset:] if offset else qs), False
+        return qs[offset:offset + limit], False
+
+    qs, ordering = filter_by_cursors(qs, after, before)
+    if last is not None:
+        last = get_page_size(last, max_page_size)
+        return qs.reverse()[:last], True
+    first = get_page_size(first, max_page_size)
+    if first is None:
+        return qs, False
+    return qs[:first], False
+
+
+# returns instances of the page and tells if there are more rows in the
+# paginated direction. one extra row is fetched instead of counting rows
+def get_page(qs, first=None, after=None, last=None, before=None, max_page_size=None):
+    max_page_size = get_max_page_size(max_page_size)
+    validate(first=first, last=last)
+
+    qs, ordering = filter_by_cursors(qs, after, before)
+    reverse = last is not None
+    if reverse:
+        qs = qs.reverse()
+    size = get_page_size(last if reverse else first, max_page_size)
+    if size is None:
+        instances, has_more = list(qs), False
+    else:
+        instances = list(qs[:size + 1])
+        has_more = len(instances) > size
+        instances = instances[:size]
+    if reverse:
+        instances.reverse()
+    return instances, has_more, ordering
+
+
+def validate(**arguments):
+    for name, value in arguments.items():
+        if value is not None and value < 0:
+            raise ValueError(f'Pagination argument "{name}" cannot be negative')
+    if arguments['first'] is not None and arguments['last'] is not None:
+        raise ValueError('Pagination arguments "first" and "last" cannot be used together')
+
+
+# null values are sorted after other values, so that null is the greatest
+# value in both directions and cursor filters can compare with it
+def filter_by_cursors(qs, after, before):
+    ordering = get_ordering(qs)
+    qs = qs.order_by(*[get_order_by(field_name) for field_name in ordering])
+    if after is not None:
+        qs = qs.filter(get_cursor_filter(ordering, decode_cursor(after), after=True))
+    if before is not None:
+        qs = qs.filter(get_cursor_filter(ordering, decode_cursor(before), after=False))
+    return qs, ordering
+
+
+def get_page_size(size, max_page_size):
+    if max_page_size is None:
+        return size
+    if size is None:
+        return max_page_size
+    return min(size, max_page_size)
+
+
+# ordering of the queryset with primary key as the last key so that every
+# row has an unique position
+def get_ordering(qs):
+    ordering = list(qs.query.order_by or qs.model._meta.ordering)
+    for field_name in ordering:
+        if not isinstance(field_name, str) or field_name == '?':
+            raise ValueError('Cursor pagination supports only ordering by field names')
+    field_names = [field_name.lstrip('-') for field_name in ordering]
+    if 'pk' not in field_names and qs.model._meta.pk.name not in field_names:
+        ordering.append('pk')
+    return ordering
+
+
+def get_order_by(field_name):
+    if field_name.startswith('-'):
+        return F(field_name[1:]).desc(nulls_first=True)
+    return F(field_name).asc(nulls_last=True)
+
+
+def get_cursor_filter(ordering, values, after):
+    if len(values) != len(ordering):
+        raise ValueError('Invalid cursor')
+    q = Q()
+    for i, field_name in enumerate(ordering):
+        descending = field_name.startswith('-')
+        condition = get_range_filter(field_name.lstrip('-'), values[i], greater=descending != after)
+        if condition is None:
+            continue
+        for previous_field_name, value in zip(ordering[:i], values):
+            condition &= get_equal_filter(previous_field_name.lstrip('-'), value)
+        q |= condition
+    return q
+
+
+# returns None when no value is in the range
+def get_range_filter(field_name, value, greater):
+    if value is None:
+        return None if greater else Q(**{f'{field_name}__isnull': False})
+    if greater:
+        return Q(**{f'{field_name}__gt': value}) | Q(**{f'{field_name}__isnull': True})
+    return Q(**{f'{field_name}__lt': value})
+
+
+def get_equal_filter(field_name, value):
+    if value is None:
+        return Q(**{f'{field_name}__isnull': True})
+    return Q(**{field_name: value})
+
+
+def get_cursor(instance, ordering):
+    values = []
+    for field_name in ordering:
+        value = instance
+        for attr in field_name.lstrip('-').split('__'):
+            value = getattr(value, attr)
+        if isinstance(value, models.Model):
+            value = value.pk
+        values.append(value)
+    return encode_cursor(values)
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=DjangoJSONEncoder).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
@@ -1,7 +1,7 @@
 from ..registers import TypeRegister
 from django.db.models.base import ModelBase
 
-def resolve_type_args(args, types=None, is_input=False, single=False):
+def resolve_type_args(args, types=None, is_input=False, is_filter=False, single=False):
     arg_types = TypeRegister()
     models = []
     for arg in args:
@@ -24,6 +24,9 @@ def resolve_type_args(args, types=None, is_input=False, single=False):
         if is_input:
             input_type = get_type(model, arg_types, types, is_input=True)
             return_args.append((model, output_type, input_type))
+        elif is_filter:
+            filter_type = get_filter_type(model, arg_types, types)
+            return_args.append((model, output_type, filter_type))
         else:
             return_args.append((model, output_type))
         if single:
@@ -37,3 +40,10 @@ def get_type(model, arg_types, types, is_input):
     if not type:
         raise TypeError(f"No type for model '{model._meta.object_name}'")
     return type
+
+# filter type is None when no filter type has been registered for the model
+def get_filter_type(model, arg_types, types):
+    type = arg_types.filters.get(model)
+    if not type and types:
+        type = types.filters.get(model)
+    return type
@@ -1,17 +1,37 @@
 from typing import List, Optional
 import strawberry
 from . import resolvers
-from .. import utils
+from ..meta import get_model_meta
 from .arguments import resolve_type_args
 
-def queries(*args, types=None):
-    type_args = resolve_type_args(args, types=types)
+_query_types = {}
+
+# query type is cached by the resolved types, that way schemas which are
+# built from the same types do not generate resolvers again. by_ids and
+# connection add object list and relay style connection fields and where
+# is passed to list fields
+def queries(*args, types=None, by_ids=False, connection=False, where=None):
+    type_args = tuple(resolve_type_args(args, types=types, is_filter=True))
+    key = (type_args, by_ids, connection, where)
+    query_type = _query_types.get(key)
+    if query_type:
+        return query_type
     query_fields = {}
-    for model, object_type in type_args:
-        object_name = utils.camel_to_snake(model._meta.object_name)
+    for model, object_type, filter_type in type_args:
+        object_name = get_model_meta(model).snake_name
         query_fields[f'{object_name}'] = resolvers.get_object_resolver(model, object_type)
-        query_fields[f'{object_name}s'] = resolvers.get_list_resolver(model, object_type)
-    return strawberry.type(type('Query', (), query_fields))
+        list_args = (object_type, filter_type) if filter_type else (object_type,)
+        query_fields[f'{object_name}s'] = resolvers.get_list_resolver(model, *list_args, where=where)
+        if by_ids:
+            query_fields[f'{object_name}s_by_ids'] = resolvers.get_objects_resolver(model, object_type)
+        if connection:
+            query_fields[f'{object_name}s_connection'] = resolvers.get_connection_resolver(
+                    model, *list_args, where=where)
+    query_type = strawberry.type(type('Query', (), query_fields))
+    _query_types[key] = query_type
+    return query_type
 
 queries.get = resolvers.get_object_resolver
 queries.list = resolvers.get_list_resolver
+queries.by_ids = resolvers.get_objects_resolver
+queries.connection = resolvers.get_connection_resolver
@@ -1,42 +1,151 @@
 from django.db import models
+from graphql.execution.values import get_argument_values
 from typing import List, Optional
+import asyncio
 import inspect
 import strawberry
-from .. import hooks, utils
-from ..resolvers import django_resolver
+from .. import connection, cost, filter_types, hooks, loaders, optimizer, pagination, utils
+from ..meta import get_model_meta
+from ..resolvers import django_field_resolver, django_resolver
 from .arguments import resolve_type_args
 
 
 def get_object_resolver(*args, types=None):
     model, object_type = resolve_type_args(args, types=types, single=True)
+    def get_queryset(info):
+        return optimizer.optimize(model.objects.all(), info, object_type, optimizer.get_sibling_fields(info))
     @strawberry.field
-    @django_resolver
-    def resolver(id: strawberry.ID) -> object_type:
-        obj = model.objects.get(id=id)
-        return obj
+    def resolver(info, id: strawberry.ID) -> object_type:
+        if utils.is_async():
+            return get_object_async(model, loaders.get_object_loader(info, get_queryset), id)
+        # invalid id fails only the field which has selected it
+        loaders.to_pk(model, id)
+        return get_object(model, load_object(info, get_queryset, id))
     return resolver
 
 
-def get_list_resolver(*args, types=None, queryset=None):
+def get_objects_resolver(*args, types=None):
     model, object_type = resolve_type_args(args, types=types, single=True)
+    def get_queryset(info):
+        return optimizer.optimize(model.objects.all(), info, object_type, optimizer.get_sibling_fields(info))
+    @strawberry.field
+    def resolver(info, ids: List[strawberry.ID]) -> List[Optional[object_type]]:
+        if utils.is_async():
+            return get_objects_async(loaders.get_object_loader(info, get_queryset), ids)
+        return loaders.fetch_objects(get_queryset(info), ids, loaders.get_identity_map(info))
+    return resolver
+
+
+# objects of all fields which are selected with the same name on the same
+# level of the query are loaded when the first of them is resolved
+def load_object(info, get_queryset, id):
+    key = (info.parent_type.name, info.field_name)
+    objects = utils.get_request_state(info).setdefault('objects', {}).setdefault(key, {})
+    if id not in objects:
+        ids = [id, *(sibling_id for sibling_id in get_sibling_ids(info) if sibling_id not in objects)]
+        ids = list(dict.fromkeys(ids))
+        objects.update(zip(ids, loaders.fetch_objects(get_queryset(info), ids, loaders.get_identity_map(info))))
+    return objects[id]
+
+
+def get_sibling_ids(info):
+    field = info.parent_type.fields[info.field_name]
+    return [get_argument_values(field, node, info.variable_values)['id']
+            for node in optimizer.get_sibling_fields(info)]
+
+
+def get_object(model, obj):
+    if obj is None:
+        raise model.DoesNotExist(f'{model._meta.object_name} matching query does not exist.')
+    return obj
+
+
+async def get_object_async(model, loader, id):
+    loaders.to_pk(model, id)
+    return get_object(model, await loader.load(id))
+
+
+async def get_objects_async(loader, ids):
+    return await asyncio.gather(*[loader.load(id) for id in ids])
+
+
+def get_list_resolver(*args, types=None, queryset=None, max_page_size=None, stream=False, chunk_size=None, where=None):
+    model, object_type, filter_type = resolve_type_args(args, types=types, is_filter=True, single=True)
+    filter_type = get_where_type(model, filter_type, where)
+    @hooks.add(queryset=queryset)
+    @strawberry.field
+    @django_resolver
+    @where_argument(filter_type)
+    def resolver(info, where: Optional[filter_type] = None,
+            filters: Optional[List[str]] = [], order_by: Optional[List[str]] = [],
+            first: Optional[int] = None, after: Optional[str] = None,
+            last: Optional[int] = None, before: Optional[str] = None,
+            offset: Optional[int] = None, limit: Optional[int] = None) -> List[object_type]:
+        class context:
+            qs = filter_types.apply_filter(model.objects.all(), where)
+            qs = utils.apply_filters(qs, filters, order_by)
+        def queryset(hook):
+            context.qs = hook(info=info, qs=context.qs)
+        resolver._call_hooks('queryset', queryset)
+        qs = optimizer.optimize(context.qs, info, object_type)
+        qs, reverse = pagination.paginate(qs, first, after, last, before, offset, limit,
+                max_page_size=max_page_size)
+        qs = cost.limit_rows(qs, info)
+        if stream:
+            return loaders.iterate_chunks(qs, chunk_size)
+        instances = list(qs)
+        if reverse:
+            instances.reverse()
+        loaders.add_identities(loaders.get_identity_map(info), instances)
+        return instances
+    return resolver
+
+
+def get_connection_resolver(*args, types=None, queryset=None, max_page_size=None, where=None):
+    model, object_type, filter_type = resolve_type_args(args, types=types, is_filter=True, single=True)
+    filter_type = get_where_type(model, filter_type, where)
+    connection_type = connection.get_connection_type(object_type)
     @hooks.add(queryset=queryset)
     @strawberry.field
     @django_resolver
-    def resolver(info, filters: Optional[List[str]] = [], order_by: Optional[List[str]] = []) -> List[object_type]:
+    @where_argument(filter_type)
+    def resolver(info, where: Optional[filter_type] = None,
+            filters: Optional[List[str]] = [], order_by: Optional[List[str]] = [],
+            first: Optional[int] = None, after: Optional[str] = None,
+            last: Optional[int] = None, before: Optional[str] = None) -> connection_type:
         class context:
-            qs = model.objects.all()
-        if filters:
-            filter, exclude = utils.process_filters(filters)
-            context.qs = context.qs.filter(**filter).exclude(**exclude)
-        if order_by:
-            context.qs = context.qs.order_by(*order_by)
+            qs = filter_types.apply_filter(model.objects.all(), where)
+            qs = utils.apply_filters(qs, filters, order_by)
         def queryset(hook):
             context.qs = hook(info=info, qs=context.qs)
         resolver._call_hooks('queryset', queryset)
-        return context.qs
+        qs = optimizer.optimize_connection(context.qs, info, object_type)
+        return connection.get_connection(connection_type, qs, context.qs, first, after, last, before,
+                max_page_size=cost.get_page_size_limit(info, max_page_size))
     return resolver
 
 
+# lists have where argument when filter type of the model has been registered.
+# where=True generates the default filter type and where=False removes it
+def get_where_type(model, filter_type=None, where=None):
+    if where is False:
+        return None
+    if filter_type is None and where:
+        return filter_types.get_filter_type(model)
+    return filter_type
+
+
+def where_argument(filter_type):
+    def wrapper(resolver):
+        if filter_type is None:
+            del resolver.__annotations__['where']
+            signature = inspect.signature(resolver)
+            resolver.__signature__ = signature.replace(parameters=[parameter
+                    for parameter in signature.parameters.values() if parameter.name != 'where'])
+        return resolver
+    return wrapper
+
+
 def get_resolver(resolver=None, field_name=None, is_relation=False, is_m2m=False):
     if resolver:
         if inspect.iscoroutinefunction(resolver):
@@ -51,8 +160,12 @@ def get_resolver(resolver=None, field_name=None, is_relation=False, is_m2m=False
         return None
 
     if is_m2m:
-        def resolver(root, info, filters: Optional[List[str]] = [], order_by: Optional[List[str]] = []):
-            return get_instance_field(root, field_name, info, filters, order_by)
+        def resolver(root, info, filters: Optional[List[str]] = [], order_by: Optional[List[str]] = [],
+                first: Optional[int] = None, after: Optional[str] = None,
+                last: Optional[int] = None, before: Optional[str] = None,
+                offset: Optional[int] = None, limit: Optional[int] = None):
+            pagination_args = pagination.get_arguments(first, after, last, before, offset, limit)
+            return get_instance_field(root, field_name, info, filters, order_by, pagination_args)
         return resolver
 
     else:
@@ -60,18 +173,18 @@ def get_resolver(resolver=None, field_name=None, is_relation=False, is_m2m=False
             return get_instance_field(root, field_name, info)
         return resolver
 
-@django_resolver
-def get_instance_field(instance, field_name, info=None, filters=None, order_by=None):
-    attr = getattr(instance, field_name or info.field_name)
+def get_instance_field(instance, field_name, info=None, filters=None, order_by=None, pagination_args=None):
+    field_name = field_name or info.field_name
+    field = get_model_meta(type(instance)).get_field(field_name)
+    if field and loaders.is_foreign_key(field):
+        return loaders.load_foreign_key(info, instance, field)
+    if field and loaders.is_many(field):
+        return loaders.load_many(info, instance, field, filters, order_by, pagination_args)
+    return get_relation_field(instance, field_name, filters, order_by)
+
+@django_field_resolver
+def get_relation_field(instance, field_name, filters=None, order_by=None):
+    attr = getattr(instance, field_name)
     if not isinstance(attr, (models.QuerySet, models.Manager)):
         return attr
-
-    # m2m
-    qs = attr.all()
-    if filters:
-        filter, exclude = utils.process_filters(filters)
-        qs = qs.filter(**filter).exclude(**exclude)
-    if order_by:
-        qs = qs.order_by(*order_by)
-    return qs
-
+    return utils.apply_filters(attr.all(), filters, order_by)
@@ -3,6 +3,7 @@ class TypeRegister:
         self.generic = {}
         self.types = {}
         self.inputs = {}
+        self.filters = {}
 
     # key can be field name, django model field or django model
     def register(self, key, type=None):
@@ -22,7 +23,9 @@ class TypeRegister:
         return wrapper
 
     def add(self, key, type):
-        if hasattr(type, '_type_definition'):
+        if getattr(type, '_is_filter', False):
+            self.filters[key] = type
+        elif hasattr(type, '_type_definition'):
             if type._type_definition.is_input:
                 self.inputs[key] = type
             else:
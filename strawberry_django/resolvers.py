@@ -1,23 +1,54 @@
+from django.core.exceptions import SynchronousOnlyOperation
 from django.db import models
 from asgiref.sync import sync_to_async
 import functools
-from . import utils
+import types
+from . import loaders, utils
 
 
 # decorator which is used with async views to secure django orm calls to
-# be done in sync context. django orm does not support async yet
+# be done in sync context. resolvers are moved to a thread, they may have
+# side effects before they access the database
 def django_resolver(resolver=None):
     @functools.wraps(resolver)
     def wrapper(*args, **kwargs):
         if utils.is_async():
-            return sync_to_async(call_resolver, thread_sensitive=True)(resolver, *args, **kwargs)
+            return sync_to_async(call_sync_resolver, thread_sensitive=True)(resolver, *args, **kwargs)
         else:
-            return resolver(*args, **kwargs)
+            return call_resolver(resolver, *args, **kwargs)
     return wrapper
 
 
+# generated field resolvers usually read data which has been loaded by the
+# root resolver. in async context they are called in the event loop and
+# moved to a thread only when they access the database, django raises an
+# error before the query is executed. custom resolvers use django_resolver
+def django_field_resolver(resolver):
+    @functools.wraps(resolver)
+    def wrapper(*args, **kwargs):
+        if not utils.is_async():
+            return call_resolver(resolver, *args, **kwargs)
+        try:
+            return call_resolver(resolver, *args, **kwargs)
+        except SynchronousOnlyOperation:
+            return sync_to_async(call_sync_resolver, thread_sensitive=True)(resolver, *args, **kwargs)
+    return wrapper
+
+
+def call_sync_resolver(resolver, *args, **kwargs):
+    with utils.async_context(False):
+        result = call_resolver(resolver, *args, **kwargs)
+        # generators would access the database in the event loop
+        if isinstance(result, types.GeneratorType):
+            result = list(result)
+        return result
+
+
 def call_resolver(resolver, *args, **kwargs):
     result = resolver(*args, **kwargs)
     if isinstance(result, models.QuerySet):
         result = list(result)
+    if isinstance(result, list) and result and isinstance(result[0], models.Model):
+        if not hasattr(result[0], '_strawberry_django_batch'):
+            loaders.set_batch(result)
     return result
@@ -0,0 +1,49 @@
+from django.conf import settings
+
+# default values of STRAWBERRY_DJANGO django setting
+DEFAULTS = {
+    # load only model fields which are selected in the query
+    'OPTIMIZER_ONLY_FIELDS': False,
+    # maximum number of rows returned by list fields, None means no limit
+    'MAX_PAGE_SIZE': None,
+    # create_batch mutations insert rows with bulk_create
+    'BULK_CREATE': False,
+    # number of rows inserted in a single query, None means database backend limit
+    'BULK_CREATE_BATCH_SIZE': None,
+    # send m2m_changed signals when mutations change many-to-many relations
+    'M2M_CHANGED_SIGNALS': False,
+    # maximum number of rows deleted in a single query, None means no limit
+    'DELETE_CHUNK_SIZE': None,
+    # number of rows fetched at a time by streaming list queries
+    'STREAM_CHUNK_SIZE': 2000,
+    # number of identical queries of one resolver path which is reported as n+1
+    'N_PLUS_ONE_THRESHOLD': 5,
+    # maximum estimated cost of a query, None means no limit
+    'MAX_QUERY_COST': None,
+    # query cost weights of object types by type name, other types weigh 1
+    'QUERY_COST_WEIGHTS': {},
+    # estimated number of rows of list fields when page size is not known
+    'QUERY_COST_LIST_SIZE': 100,
+    # maximum number of model instances resolved by a query, None means no limit.
+    # root lists fetch at most one row more, prefetched relations are only counted
+    'MAX_ROWS': None,
+    # maximum number of model instances kept in the identity map of a query,
+    # None disables the identity map
+    'IDENTITY_MAP_SIZE': 10000,
+    # generate types when the schema is created instead of when they are declared
+    'LAZY_TYPES': False,
+    # generated mutations are executed in a transaction. 'mutation' uses one
+    # transaction for each mutation and 'operation' one transaction for all
+    # mutations of the operation with TransactionExtension. None executes
+    # mutations in autocommit mode when they do not need a transaction
+    'MUTATION_TRANSACTION': 'mutation',
+    # isolation level of mutation transactions, None means database default
+    'MUTATION_ISOLATION_LEVEL': None,
+    # postgresql synchronous_commit of mutation transactions, None means database default
+    'MUTATION_SYNCHRONOUS_COMMIT': None,
+}
+
+
+def get(name):
+    user_settings = getattr(settings, 'STRAWBERRY_DJANGO', {})
+    return user_settings.get(name, DEFAULTS[name])
@@ -0,0 +1,91 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+import contextlib
+import contextvars
+import time
+from . import settings
+
+
+# function which is called with commit timings of the current execution and
+# database alias of the transaction which is kept open for all mutations
+# of the operation
+_commit_hook = contextvars.ContextVar('strawberry_django_commit_hook', default=None)
+_operation_using = contextvars.ContextVar('strawberry_django_operation_using', default=None)
+
+ISOLATION_LEVELS = {
+    'read committed': 'READ COMMITTED',
+    'repeatable read': 'REPEATABLE READ',
+    'serializable': 'SERIALIZABLE',
+}
+
+SYNCHRONOUS_COMMIT_VALUES = ('on', 'off', 'local', 'remote_write', 'remote_apply')
+
+
+# generated mutations are executed in one transaction unless MUTATION_TRANSACTION
+# setting or atomic argument of the mutation disables it. mutations which
+# need a transaction for consistent results pass atomic=True
+def mutation_atomic(info, using, atomic=None, isolation_level=None, synchronous_commit=None):
+    if atomic is None:
+        atomic = settings.get('MUTATION_TRANSACTION') is not None
+    if not atomic:
+        return contextlib.nullcontext()
+    return atomic_block(info.path.key, using, isolation_level, synchronous_commit)
+
+
+# mutations which are executed in the transaction of the operation join it
+# without a savepoint. options are applied and commit is reported only by
+# the outermost transaction block
+@contextlib.contextmanager
+def atomic_block(path, using=None, isolation_level=None, synchronous_commit=None):
+    if using is None:
+        using = DEFAULT_DB_ALIAS
+    if _operation_using.get() == using:
+        with transaction.atomic(using=using, savepoint=False):
+            yield
+        return
+
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    start = time.perf_counter()
+    with transaction.atomic(using=using):
+        if outermost:
+            set_transaction_options(connection, isolation_level, synchronous_commit)
+        yield
+        committed = outermost and not connection.needs_rollback
+        commit_start = time.perf_counter()
+    if committed:
+        log_commit(path, using, commit_start - start, time.perf_counter() - commit_start)
+
+
+# isolation level and synchronous_commit are set for the current transaction
+# only. synchronous_commit is postgresql setting and it is ignored by other
+# databases, isolation level can not be changed silently
+def set_transaction_options(connection, isolation_level=None, synchronous_commit=None):
+    if isolation_level is None:
+        isolation_level = settings.get('MUTATION_ISOLATION_LEVEL')
+    if synchronous_commit is None:
+        synchronous_commit = settings.get('MUTATION_SYNCHRONOUS_COMMIT')
+    statements = []
+    if isolation_level is not None:
+        level = ISOLATION_LEVELS.get(str(isolation_level).lower())
+        if level is None:
+            raise ValueError(f'Unknown isolation level {isolation_level}')
+        if connection.vendor != 'postgresql':
+            raise ValueError(f'Isolation level of {connection.vendor} transaction can not be set')
+        statements.append(f'SET TRANSACTION ISOLATION LEVEL {level}')
+    if synchronous_commit is not None:
+        if isinstance(synchronous_commit, bool):
+            synchronous_commit = 'on' if synchronous_commit else 'off'
+        if synchronous_commit not in SYNCHRONOUS_COMMIT_VALUES:
+            raise ValueError(f'Unknown synchronous_commit value {synchronous_commit}')
+        if connection.vendor == 'postgresql':
+            statements.append(f'SET LOCAL synchronous_commit = {synchronous_commit}')
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+def log_commit(path, using, duration, commit_duration):
+    hook = _commit_hook.get()
+    if hook is not None:
+        hook(path=path, using=using, duration=duration, commit_duration=commit_duration)
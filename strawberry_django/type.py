@@ -1,38 +1,61 @@
 import strawberry
 import typing
-from .types import get_model_fields, update_fields
+from .types import (LazyTypeDefinition, get_model_fields, is_lazy, resolve_lazy_type, set_lazy_type,
+        update_fields)
 
 _type = type
 
-def type(model, *, fields=None, types=None, is_update=False, **kwargs):
+# lazy types inspect model fields and wrap resolvers when their definition
+# is needed for the first time, usually when the schema is created
+def type(model, *, fields=None, types=None, is_update=False, lazy=None, **kwargs):
     def wrapper(cls):
         is_input = kwargs.get('is_input', False)
-        model_fields = get_model_fields(cls, model, fields, types, is_input, is_update)
-        if not hasattr(cls, '__annotations__'):
-            cls.__annotations__ = {}
-        for field_name, field_type, field_value in model_fields:
-            cls.__annotations__[field_name] = field_type
-            setattr(cls, field_name, field_value)
-        update_fields(cls, model)
+        def generate():
+            model_fields = get_model_fields(cls, model, fields, types, is_input, is_update)
+            if not hasattr(cls, '__annotations__'):
+                cls.__annotations__ = {}
+            for field_name, field_type, field_value in model_fields:
+                cls.__annotations__[field_name] = field_type
+                setattr(cls, field_name, field_value)
+            update_fields(cls, model)
+            return strawberry.type(cls, **kwargs)
         cls._django_model = model
         cls._is_update = is_update
-        return strawberry.type(cls, **kwargs)
+        if is_lazy(lazy):
+            return set_lazy_type(cls, generate, kwargs.get('name'), is_input)
+        return generate()
     return wrapper
 
 
-def input(model, *, fields=None, types=None, is_update=False, **kwargs):
-    return type(model, fields=fields, types=types, is_update=is_update, is_input=True, **kwargs)
+def input(model, *, fields=None, types=None, is_update=False, lazy=None, **kwargs):
+    return type(model, fields=fields, types=types, is_update=is_update, lazy=lazy, is_input=True, **kwargs)
+
 
+_update_types = {}
 
+# update input type is generated once for each input type, schemas which are
+# built from the same input type share the generated type
 def generate_update_from_input(model, input):
     if input._is_update:
         return input
+    update_type = _update_types.get((model, input))
+    if update_type:
+        return update_type
     cls = _type(f'{input.__name__}Update', (), { '__annotations__': {}})
-    for field_name, field_type in input.__annotations__.items():
-        field_value = getattr(input, field_name)
-        if typing.get_origin(field_type) != typing.Optional:
-            field_type = typing.Optional[field_type]
-        cls.__annotations__[field_name] = field_type
-        setattr(cls, field_name, field_value)
+    # update type of a lazy input type is generated after the input type
+    def generate():
+        resolve_lazy_type(input)
+        for field_name, field_type in input.__annotations__.items():
+            field_value = getattr(input, field_name)
+            if typing.get_origin(field_type) != typing.Optional:
+                field_type = typing.Optional[field_type]
+            cls.__annotations__[field_name] = field_type
+            setattr(cls, field_name, field_value)
+        return strawberry.type(cls, is_input=True)
     cls._django_model = model
-    return strawberry.type(cls, is_input=True)
+    if isinstance(input._type_definition, LazyTypeDefinition):
+        update_type = set_lazy_type(cls, generate, is_input=True)
+    else:
+        update_type = generate()
+    _update_types[(model, input)] = update_type
+    return update_type
@@ -1,11 +1,13 @@
 from django.db.models import fields
 from strawberry.arguments import UNSET
+from strawberry.utils.str_converters import to_camel_case
 from typing import get_origin, List, Optional
 import dataclasses
 import datetime, decimal, uuid
 import strawberry
-from . import utils
+from . import settings, utils
 from .fields import DjangoField, field as strawberry_django_field
+from .meta import get_model_meta
 
 
 field_type_map = {
@@ -56,6 +58,46 @@ class LazyModelType(strawberry.LazyType):
                 f" which has related model '{model._meta.object_name}'")
 
 
+# type definition of a type which is generated when its definition is needed
+# for the first time, usually when the schema is created. name and kind of
+# the type are known before the type is generated
+class LazyTypeDefinition:
+    is_interface = False
+    is_generic = False
+
+    def __init__(self, cls, generate, name, is_input):
+        self.cls, self.generate, self.name, self.is_input = cls, generate, name, is_input
+
+    # strawberry replaces the lazy definition of the class when it is generated
+    def resolve(self):
+        type_definition = self.cls.__dict__['_type_definition']
+        if type_definition is self:
+            self.generate()
+            type_definition = self.cls.__dict__['_type_definition']
+        return type_definition
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+
+def is_lazy(lazy=None):
+    if lazy is None:
+        lazy = settings.get('LAZY_TYPES')
+    return lazy
+
+
+def set_lazy_type(cls, generate, name=None, is_input=False):
+    cls._type_definition = LazyTypeDefinition(cls, generate, name or to_camel_case(cls.__name__), is_input)
+    return cls
+
+
+def resolve_lazy_type(cls):
+    type_definition = cls._type_definition
+    if isinstance(type_definition, LazyTypeDefinition):
+        type_definition.resolve()
+    return cls
+
+
 def get_field_type(field, type_register, is_input):
     db_field_type = type(field)
 
@@ -112,15 +154,15 @@ def process_fields(fields, model):
     if fields is None:
         return field_names
 
-    model_field_names = [field.name for field in model._meta.get_fields()]
+    meta = get_model_meta(model)
 
     for field in fields:
         if isinstance(field, str):
             field_name = field
         else:
             raise TypeError('Type of field parameter should be str')
-        if field_name not in model_field_names:
-            raise AttributeError(f"Django model '{model._meta.object_name}' has no field '{field_name}'")
+        if field_name not in meta.field_names:
+            raise AttributeError(f"Django model '{meta.object_name}' has no field '{field_name}'")
         field_names.append(field_name)
     return field_names
 
@@ -129,11 +171,11 @@ def get_model_fields(cls, model, fields, types, is_input, is_update):
     if fields == []:
         return []
 
-    field_names = process_fields(fields,  model)
+    field_names = set(process_fields(fields,  model))
     type_register = types
 
     model_fields = []
-    for field in model._meta.get_fields():
+    for field in get_model_meta(model).fields:
         if not is_in(field.name, field_names, default=True):
             continue
 
@@ -181,13 +223,25 @@ def get_model_fields(cls, model, fields, types, is_input, is_update):
 
 # post processing fields before passing them to strawberry
 def update_fields(cls, model):
+    # maps python field names of the type to django model field names,
+    # query optimizer uses this to find out which model fields are selected
+    meta = get_model_meta(model)
+    django_fields = {}
+    for field_name in cls.__annotations__:
+        if meta.get_field(field_name):
+            django_fields[field_name] = field_name
+
     for field_name, field in cls.__dict__.items():
         if not isinstance(field, DjangoField):
             continue
 
         django_field_name = field.field_name or field_name
         django_field = model._meta.get_field(django_field_name)
-        is_m2m = django_field.many_to_many or django_field.one_to_many
+        is_m2m = meta.is_many(django_field.name)
+        django_fields[field_name] = django_field.name
 
+        field.field_name = django_field.name
         field = field.resolve(django_field.is_relation, is_m2m)
         setattr(cls, field_name, field)
+
+    cls._django_fields = django_fields
@@ -1,27 +1,46 @@
 import strawberry
+from django.db import connections
 from django.db.models import fields
-import ast
 import asyncio
+import contextlib
+import contextvars
+from . import filters
 
 def parse_value(value):
-    try:
-        return ast.literal_eval(value)
-    except ValueError:
-        raise ValueError('Invalid filter value')
-
-def process_filters(filters):
-    filter, exclude = {}, {}
-    for string in filters:
-        try:
-            k, v = string.split('=', 1)
-        except ValueError:
-            raise ValueError(f'Invalid filter "{filter}"')
-        if '!' in k:
-            k = k.strip('!')
-            exclude[k] = parse_value(v)
-        else:
-            filter[k] = parse_value(v)
-    return filter, exclude
+    return filters.parse_value(value)
+
+def process_filters(filter_list):
+    return filters.parse_filters(filter_list)
+
+def apply_filters(qs, filter_list, order_by=None):
+    if filter_list:
+        filter, exclude = filters.compile_filters(qs.model, filter_list)
+        qs = qs.filter(filter).exclude(exclude)
+    if order_by:
+        qs = qs.order_by(*order_by)
+    return qs
+
+# splits values to chunks which fit to the query parameter limit of the
+# database. reserved is the number of other parameters of the query
+def chunk_params(values, using, reserved=0):
+    max_params = connections[using].features.max_query_params
+    if not max_params or len(values) + reserved <= max_params:
+        return [values] if values else []
+    size = max(max_params - reserved, 1)
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+_generated_type_names = set()
+
+# names of generated types are unique. generated type which would have the
+# same name as another generated type gets a number suffix, for example the
+# connection types of two object types which are both named User
+def get_unique_type_name(name):
+    unique_name, number = name, 1
+    while unique_name in _generated_type_names:
+        number += 1
+        unique_name = f'{name}{number}'
+    _generated_type_names.add(unique_name)
+    return unique_name
 
 def get_input_data(model, data):
     values = {}
@@ -51,14 +70,50 @@ def camel_to_snake(s):
 def snake_to_camel(s):
     return s.title().replace('_', '')
 
+# tells if resolvers are executed in async context. value is set once for
+# each execution by AsyncContextExtension and it is False in the threads of
+# sync_to_async calls. None means that the context is detected on every call
+_async_context = contextvars.ContextVar('strawberry_django_async_context', default=None)
+
 def is_async():
+    value = _async_context.get()
+    if value is not None:
+        return value
+    return detect_async()
+
+def detect_async():
     # django uses the same method to detect async operation
-    # https://github.com/django/django/blob/76c0b32f826469320c59709d31e2f2126dd7c505/django/utils/asyncio.py
     try:
-        event_loop = asyncio.get_event_loop()
+        asyncio.get_running_loop()
     except RuntimeError:
-        pass
-    else:
-        if event_loop.is_running():
-            return True
-    return False
+        return False
+    return True
+
+def set_async(value):
+    return _async_context.set(value)
+
+def reset_async(token):
+    _async_context.reset(token)
+
+@contextlib.contextmanager
+def async_context(value):
+    token = set_async(value)
+    try:
+        yield
+    finally:
+        reset_async(token)
+
+
+# key of the request state. object key cannot collide with fragment names
+_request_state_key = object()
+
+# returns dictionary for storing data during single graphql execution. the
+# dictionary of fragments is created by graphql-core for every execution, also
+# when the same parsed document is executed again, and it is released when
+# the execution ends. state is stored there so that it is never shared by
+# two executions and it does not outlive the request
+def get_request_state(info):
+    state = info.fragments.get(_request_state_key)
+    if state is None:
+        state = info.fragments[_request_state_key] = {}
+    return state
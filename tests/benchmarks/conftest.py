@@ -0,0 +1,82 @@
+from django.db import connection
+import collections
+import pytest
+import time
+import tracemalloc
+from .. import models
+
+
+Result = collections.namedtuple('Result', ['name', 'seconds', 'rows', 'queries', 'memory'],
+        defaults=[None])
+
+results = []
+
+# runs function repeatedly and records the fastest round and number of
+# database queries of one round. setup is called before each round and it
+# is not timed. without --benchmarks option functions are run only once.
+# memory allocations are traced in a separate round, because tracing is slow
+@pytest.fixture
+def benchmark(request):
+    def benchmark(func, *, rounds=5, iterations=1, name=None, unit=1, rows=None, setup=None,
+            trace_memory=False):
+        if not request.config.getoption('--benchmarks'):
+            rounds = 1
+        times = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            queries = []
+            def count_query(execute, sql, params, many, context):
+                queries.append(sql)
+                return execute(sql, params, many, context)
+            with connection.execute_wrapper(count_query):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    func()
+                times.append((time.perf_counter() - start) / iterations / unit)
+        memory = None
+        if trace_memory:
+            if setup:
+                setup()
+            tracemalloc.start()
+            try:
+                func()
+                memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        name = f'{request.node.name} {name}' if name else request.node.name
+        result = Result(name, min(times), rows, len(queries) // iterations, memory)
+        results.append(result)
+        return result
+    return benchmark
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not results or not config.getoption('--benchmarks'):
+        return
+    terminalreporter.section('benchmarks')
+    for result in results:
+        line = f'{result.name:<60} {result.seconds * 1e6:14.3f} us'
+        if result.rows:
+            line += f' {result.rows / result.seconds:14.0f} rows/s'
+        line += f' {result.queries:8d} queries'
+        if result.memory is not None:
+            line += f' {result.memory / 2**20:10.1f} MiB peak'
+        terminalreporter.write_line(line)
+
+
+# sizes above 10 rows are run only with --benchmarks option
+SIZES = [10, pytest.param(1000, marks=pytest.mark.benchmark), pytest.param(100000, marks=pytest.mark.benchmark)]
+
+def get_rounds(size):
+    return 1 if size > 1000 else 5
+
+
+# users are split to groups of 100 users, each group has three tags
+def create_users(size):
+    tags = [models.Tag.objects.create(name=f'tag{i}') for i in range(3)]
+    groups = [models.Group.objects.create(name=f'group{i}') for i in range(max(size // 100, 1))]
+    through = models.Group.tags.through
+    through.objects.bulk_create(through(group_id=group.pk, tag_id=tag.pk) for group in groups for tag in tags)
+    models.User.objects.bulk_create(models.User(name=f'user{i}', group=groups[i % len(groups)])
+            for i in range(size))
@@ -0,0 +1,85 @@
+from django.db import connection
+import math
+import pytest
+import strawberry
+import strawberry_django
+from .. import models, types
+from .conftest import SIZES, create_users, get_rounds
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(types.User)
+    Mutation = strawberry_django.mutations(types.User, types.Group, types.Tag, types=types.types)
+    return strawberry.Schema(Query, mutation=Mutation)
+
+
+def execute(schema, query, variable_values=None):
+    def run():
+        result = schema.execute_sync(query, variable_values=variable_values)
+        assert not result.errors
+    return run
+
+
+# number of queries which are needed for the values with query parameter limit
+def chunks(count, reserved=0):
+    max_params = connection.features.max_query_params
+    if not max_params or count + reserved <= max_params:
+        return 1
+    return math.ceil(count / (max_params - reserved))
+
+
+@pytest.mark.parametrize('bulk', [False, True])
+@pytest.mark.parametrize('size', SIZES)
+def test_create_batch(benchmark, schema, db, settings, size, bulk):
+    settings.STRAWBERRY_DJANGO = { 'BULK_CREATE': bulk }
+    group = models.Group.objects.create(name='group')
+    data = [{ 'name': f'user{i}', 'groupId': group.pk } for i in range(size)]
+    query = 'mutation($data: [UserInput!]!) { createUsers(data: $data) { id } }'
+    result = benchmark(execute(schema, query, { 'data': data }), rounds=get_rounds(size), rows=size,
+            setup=lambda: models.User.objects.all().delete())
+    assert models.User.objects.count() == size
+
+    # rows are inserted between savepoint and savepoint release
+    if not bulk:
+        assert result.queries == size + 2
+    elif connection.features.can_return_rows_from_bulk_insert:
+        fields = [field for field in models.User._meta.concrete_fields if field.name != 'id']
+        batch_size = connection.ops.bulk_batch_size(fields, data)
+        assert result.queries == math.ceil(size / batch_size) + 2
+    else:
+        assert result.queries == size + 2
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_update(benchmark, schema, db, size):
+    create_users(size)
+    query = 'mutation { updateUsers(data: { name: "user" }) { id name group { name } } }'
+    result = benchmark(execute(schema, query), rounds=get_rounds(size), rows=size)
+    # savepoint, primary keys, updates, savepoint release and response
+    assert result.queries == 3 + chunks(size) * 2
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_update_many_to_many(benchmark, schema, db, size):
+    create_users(size)
+    tags = list(models.Tag.objects.values_list('pk', flat=True))
+    query = 'mutation { updateGroups(data: { tagsSet: [%d, %d] }) { id } }' % tuple(tags[:2])
+    groups = models.Group.objects.count()
+    result = benchmark(execute(schema, query), rounds=get_rounds(size), rows=groups)
+    through = models.Group.tags.through
+    fields = [field for field in through._meta.concrete_fields if field.name != 'id']
+    inserts = math.ceil(groups * 2 / connection.ops.bulk_batch_size(fields, [None] * groups * 2))
+    # savepoint, primary keys, deletes, inserts, savepoint release and response
+    assert result.queries == 3 + chunks(groups, reserved=2) + inserts + chunks(groups)
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_delete(benchmark, schema, db, size):
+    def setup():
+        models.User.objects.all().delete()
+        models.User.objects.bulk_create(models.User(name=f'user{i}') for i in range(size))
+    result = benchmark(execute(schema, 'mutation { deleteUsers }'), rounds=get_rounds(size), rows=size,
+            setup=setup)
+    assert not models.User.objects.exists()
+    assert result.queries == 1
@@ -0,0 +1,50 @@
+import pytest
+import strawberry
+import strawberry_django
+from .. import types
+from .conftest import SIZES, create_users, get_rounds
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(types.User, types.Group, types.Tag, connection=True)
+    return strawberry.Schema(query=Query)
+
+
+def execute(schema, query):
+    def run():
+        result = schema.execute_sync(query)
+        assert not result.errors
+    return run
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_list(benchmark, schema, db, size):
+    create_users(size)
+    result = benchmark(execute(schema, '{ users { id name } }'), rounds=get_rounds(size), rows=size)
+    assert result.queries == 1
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_nested_relations(benchmark, schema, db, size):
+    create_users(size)
+    query = '{ users { name group { name tags { name } } } }'
+    result = benchmark(execute(schema, query), rounds=get_rounds(size), rows=size)
+    # users with groups and prefetched tags
+    assert result.queries == 2
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_reverse_relations(benchmark, schema, db, size):
+    create_users(size)
+    query = '{ groups { name users { name } tags { name } } }'
+    result = benchmark(execute(schema, query), rounds=get_rounds(size), rows=size)
+    assert result.queries == 3
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_connection(benchmark, schema, db, size):
+    create_users(size)
+    query = '{ usersConnection(first: 100) { totalCount edges { cursor node { name group { name } } } } }'
+    result = benchmark(execute(schema, query), rounds=get_rounds(size), rows=min(size, 100))
+    assert result.queries == 2
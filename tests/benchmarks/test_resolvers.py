@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+import strawberry
+import strawberry_django
+from strawberry_django import utils
+from strawberry_django.resolvers import django_field_resolver
+from .. import models
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 10000
+ROWS = 1000
+
+
+@strawberry_django.type(models.User, fields=['id', 'name'])
+class User:
+    @strawberry_django.field
+    def name_upper(root) -> str:
+        return root.name.upper()
+
+
+@pytest.fixture
+def users(transactional_db):
+    models.User.objects.bulk_create(models.User(name=f'user{i}') for i in range(ROWS))
+
+
+def get_schema(extensions=[]):
+    return strawberry.Schema(query=strawberry_django.queries(User), extensions=extensions)
+
+
+@pytest.fixture
+def resolver():
+    return django_field_resolver(lambda root: root)
+
+
+def test_field_resolver_sync(benchmark, resolver):
+    benchmark(lambda: resolver(None), iterations=CALLS)
+
+
+def test_field_resolver_async(benchmark, resolver):
+    async def run():
+        benchmark(lambda: resolver(None), iterations=CALLS, name='detected')
+        with utils.async_context(True):
+            benchmark(lambda: resolver(None), iterations=CALLS, name='context')
+    asyncio.run(run())
+
+
+# time per resolved field, query has three fields for each row
+def test_query_sync(benchmark, users):
+    schema = get_schema()
+    benchmark(lambda: schema.execute_sync('{ users { id name nameUpper } }'), unit=ROWS * 3)
+
+
+def test_query_async(benchmark, users):
+    for name, extensions in [('detected', []), ('context', [strawberry_django.AsyncContextExtension])]:
+        schema = get_schema(extensions)
+        def run():
+            asyncio.run(schema.execute('{ users { id name nameUpper } }'))
+        benchmark(run, unit=ROWS * 3, name=name)
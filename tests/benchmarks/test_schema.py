@@ -0,0 +1,70 @@
+from django.db import models
+import functools
+import pytest
+import strawberry
+import strawberry_django
+
+
+# synthetic models are registered to an app which is not installed, that way
+# they do not get database tables
+@functools.lru_cache(maxsize=None)
+def get_models(size):
+    model_list = []
+    for i in range(size):
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), { 'app_label': 'benchmarks' }),
+            'name': models.CharField(max_length=50),
+            'description': models.TextField(blank=True),
+            'number': models.IntegerField(default=0),
+            'price': models.DecimalField(max_digits=10, decimal_places=2, null=True),
+            'created': models.DateTimeField(null=True),
+            'is_active': models.BooleanField(default=True),
+        }
+        if model_list:
+            attrs['parent'] = models.ForeignKey(model_list[-1], null=True,
+                    on_delete=models.CASCADE, related_name='children')
+            attrs['links'] = models.ManyToManyField(model_list[0], related_name=f'linked{size}_{i}')
+        model_list.append(type(f'Synthetic{size}Model{i}', (models.Model,), attrs))
+    return model_list
+
+
+def declare_types(model_list, lazy=False):
+    types = strawberry_django.TypeRegister()
+    object_types = []
+    for model in model_list:
+        object_type = strawberry_django.type(model, types=types, lazy=lazy)(type(model.__name__, (), {}))
+        object_types.append(types.register(object_type))
+        input_type = strawberry_django.input(model, types=types, lazy=lazy)(type(f'{model.__name__}Input', (), {}))
+        types.register(input_type)
+    Query = strawberry_django.queries(*object_types, types=types, by_ids=True, connection=True)
+    Mutation = strawberry_django.mutations(*object_types, types=types)
+    return Query, Mutation
+
+
+def build_schema(model_list, lazy=False):
+    Query, Mutation = declare_types(model_list, lazy)
+    return strawberry.Schema(query=Query, mutation=Mutation)
+
+
+SIZES = [10, pytest.param(300, marks=pytest.mark.benchmark)]
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('size', SIZES)
+def test_build_schema(benchmark, size, lazy):
+    model_list = get_models(size)
+    result = benchmark(lambda: build_schema(model_list, lazy), rounds=3, name=f'{size} models',
+            trace_memory=True)
+    assert result.memory
+    schema = build_schema(model_list, lazy)
+    assert len(schema._schema.query_type.fields) == size * 4
+    assert len(schema._schema.mutation_type.fields) == size * 4
+
+
+# lazy types are not generated until the schema is created
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('size', SIZES)
+def test_declare_types(benchmark, size, lazy):
+    model_list = get_models(size)
+    benchmark(lambda: declare_types(model_list, lazy), rounds=3, name=f'{size} models',
+            trace_memory=True)
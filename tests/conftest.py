@@ -3,6 +3,18 @@ import strawberry
 import strawberry_django
 from . import models, types
 
+
+def pytest_addoption(parser):
+    parser.addoption('--benchmarks', action='store_true', help='run benchmarks')
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='use --benchmarks option to run benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
 @pytest.fixture
 def tag(db):
     tag = models.Tag.objects.create(name='tag')
@@ -29,6 +41,6 @@ def users(db):
 
 @pytest.fixture
 def schema():
-    Query = strawberry_django.queries(types.User, types.Group, types.Tag)
+    Query = strawberry_django.queries(types.User, types.Group, types.Tag, connection=True)
     schema = strawberry.Schema(query=Query)
     return schema
@@ -0,0 +1,69 @@
+import pytest
+import strawberry
+import strawberry_django
+from django.db import connection
+from .. import models, types
+
+
+@pytest.fixture
+def bulk_create(settings):
+    settings.STRAWBERRY_DJANGO = { 'BULK_CREATE': True }
+
+
+def test_create_batch(mutation, bulk_create, django_assert_num_queries):
+    # savepoint, inserts and savepoint release
+    inserts = 1 if connection.features.can_return_rows_from_bulk_insert else 3
+    with django_assert_num_queries(inserts + 2):
+        result = mutation('{ users: createUsers(data: [{ name: "user1" }, { name: "user2" }, { name: "user3" }]) { id name } }')
+    assert not result.errors
+    assert result.data['users'] == [
+        { 'id': '1', 'name': 'user1' },
+        { 'id': '2', 'name': 'user2' },
+        { 'id': '3', 'name': 'user3' },
+    ]
+    assert list(models.User.objects.values_list('name', flat=True)) == ['user1', 'user2', 'user3']
+
+
+def test_many_to_many(mutation, bulk_create, db, django_assert_num_queries):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(2)]
+    inserts = 1 if connection.features.can_return_rows_from_bulk_insert else 2
+    with django_assert_num_queries(inserts + 3):
+        result = mutation('''{ groups: createGroups(data: [
+            { name: "group1", tagsSet: [%d, %d] },
+            { name: "group2", tagsAdd: [%d] },
+        ]) { id } }''' % (tags[0].pk, tags[1].pk, tags[1].pk))
+    assert not result.errors
+    group1, group2 = models.Group.objects.order_by('pk')
+    assert list(group1.tags.order_by('pk')) == tags
+    assert list(group2.tags.all()) == tags[1:]
+
+
+def test_hooks(bulk_create, db):
+    def hook(info, instance):
+        hook.data.append((instance.name, instance.pk))
+    hook.data = []
+
+    @strawberry.type
+    class Mutation:
+        create_users = strawberry_django.mutations.create_batch(models.User, types.User, types.UserInput,
+                pre_save=hook, post_save=hook)
+    schema = strawberry.Schema(strawberry_django.queries(types.User), mutation=Mutation)
+
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user1" }, { name: "user2" }]) { id } }')
+    assert not result.errors
+    assert hook.data == [('user1', None), ('user2', None), ('user1', 1), ('user2', 2)]
+
+
+def test_rollback(bulk_create, db):
+    def hook(info, instance):
+        raise ValueError('invalid group')
+
+    @strawberry.type
+    class Mutation:
+        create_groups = strawberry_django.mutations.create_batch(models.Group, types.Group, types.GroupInput,
+                post_save=hook)
+    schema = strawberry.Schema(strawberry_django.queries(types.Group), mutation=Mutation)
+
+    result = schema.execute_sync('mutation { createGroups(data: [{ name: "group1" }]) { id } }')
+    assert result.errors[0].message == 'invalid group'
+    assert not models.Group.objects.exists()
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from strawberry_django.mutations import resolvers
+from .. import models
+
+
+# primary keys are split to chunks of two values so that every
+# statement of the mutations is executed in several chunks
+@pytest.fixture
+def max_query_params(monkeypatch):
+    monkeypatch.setattr(connection.features, 'max_query_params', 2)
+
+
+@pytest.fixture
+def groups(db):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(2)]
+    groups = [models.Group.objects.create(name=f'group{i+1}') for i in range(5)]
+    for group in groups:
+        group.tags.set(tags[:1])
+    return groups, tags
+
+
+def test_update(mutation, groups, max_query_params, django_assert_num_queries):
+    groups, tags = groups
+    # savepoint, primary keys, three updates, savepoint release and three
+    # queries for the response
+    with django_assert_num_queries(9):
+        result = mutation('{ updateGroups(data: { name: "group" }) { name } }')
+    assert not result.errors
+    assert result.data['updateGroups'] == [{ 'name': 'group' }] * 5
+    assert list(models.Group.objects.values_list('name', flat=True)) == ['group'] * 5
+
+
+def test_update_many_to_many(mutation, groups, max_query_params):
+    groups, tags = groups
+    result = mutation('{ updateGroups(data: { tagsAdd: [%s] }) { id } }' % tags[1].pk)
+    assert not result.errors
+    for group in groups:
+        assert set(group.tags.values_list('pk', flat=True)) == { tags[0].pk, tags[1].pk }
+
+    result = mutation('{ updateGroups(data: { tagsRemove: [%s] }) { id } }' % tags[0].pk)
+    assert not result.errors
+    for group in groups:
+        assert list(group.tags.values_list('pk', flat=True)) == [tags[1].pk]
+
+
+def test_delete(mutation, groups, max_query_params, monkeypatch):
+    monkeypatch.setattr(resolvers, 'can_delete_returning', lambda connection: False)
+    models.User.objects.bulk_create(models.User(name=f'user{i+1}') for i in range(5))
+    result = mutation('{ deleteUsers }')
+    assert not result.errors
+    assert len(result.data['deleteUsers']) == 5
+    assert not models.User.objects.exists()
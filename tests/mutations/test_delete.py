@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+from strawberry_django.mutations import resolvers
+from .. import models
+
+
+@pytest.fixture
+def users(db):
+    return [models.User.objects.create(name=f'user{i+1}') for i in range(5)]
+
+
+def test_fast_delete(mutation, users, django_assert_num_queries):
+    # primary keys and delete are executed between savepoint and savepoint release
+    queries = 1 if resolvers.can_delete_returning(connection) else 4
+    with django_assert_num_queries(queries):
+        result = mutation('{ ids: deleteUsers(filters: ["id__gt=2"]) }')
+    assert not result.errors
+    assert result.data['ids'] == ['3', '4', '5']
+    assert list(models.User.objects.values_list('name', flat=True)) == ['user1', 'user2']
+
+
+def test_fast_delete_without_returning(mutation, users, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr(resolvers, 'can_delete_returning', lambda connection: False)
+    with django_assert_num_queries(4):
+        result = mutation('{ ids: deleteUsers(filters: ["id__lte=2"]) }')
+    assert not result.errors
+    assert result.data['ids'] == ['1', '2']
+    assert models.User.objects.count() == 3
+
+
+def test_chunked_delete(mutation, users, settings, django_assert_num_queries):
+    settings.STRAWBERRY_DJANGO = { 'DELETE_CHUNK_SIZE': 2 }
+    # chunks are deleted between savepoint and savepoint release
+    queries = 5 if resolvers.can_delete_returning(connection) else 7
+    with django_assert_num_queries(queries):
+        result = mutation('{ ids: deleteUsers(filters: ["id__gt=1"]) }')
+    assert not result.errors
+    assert result.data['ids'] == ['2', '3', '4', '5']
+    assert list(models.User.objects.values_list('name', flat=True)) == ['user1']
+
+
+def test_cascade_delete(mutation, user):
+    # users of the group are deleted by the collector
+    result = mutation('{ ids: deleteGroups }')
+    assert not result.errors
+    assert result.data['ids'] == ['1']
+    assert not models.User.objects.exists()
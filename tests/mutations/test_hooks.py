@@ -28,3 +28,25 @@ def test_save_hooks(db):
     assert not result.errors
     assert result.data['user'] == { 'id': '1' }
     assert hook.data == [ None, 1 ]
+
+@pytest.mark.parametrize('bulk', [False, True])
+def test_batch_hooks(db, bulk):
+    def hook(info, instance):
+        calls.append(('instance', instance.name))
+    def batch_hook(info, instances):
+        calls.append(('batch', [(instance.name, instance.pk) for instance in instances]))
+    calls = []
+
+    @strawberry.type
+    class Mutation:
+        create_users = strawberry_django.mutations.create_batch(models.User, types.User, types.UserInput,
+                pre_save=hook, pre_save_batch=batch_hook, bulk=bulk)
+        create_users.post_save(hook)
+        create_users.post_save_batch(batch_hook)
+    mutation = generate_mutation(Mutation)
+
+    result = mutation('{ createUsers(data: [{ name: "user1" }, { name: "user2" }]) { id } }')
+    assert not result.errors
+    assert calls[0] == ('batch', [('user1', None), ('user2', None)])
+    assert calls[-1] == ('batch', [('user1', 1), ('user2', 2)])
+    assert sorted(calls[1:-1]) == [('instance', 'user1')] * 2 + [('instance', 'user2')] * 2
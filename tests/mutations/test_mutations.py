@@ -40,6 +40,24 @@ def test_update(mutation, users):
         { 'id': 3, 'name': 'user3' },
     ]
 
+def test_update_filtered_field(mutation, users, django_assert_num_queries):
+    # savepoint, primary keys, update, savepoint release and response
+    with django_assert_num_queries(5):
+        result = mutation('{ users: updateUsers(data: { name: "me" }, filters: ["name__in=[\'user1\', \'user3\']"]) { id name } }')
+    assert not result.errors
+    assert result.data['users'] == [
+        { 'id': '1', 'name': 'me' },
+        { 'id': '3', 'name': 'me' },
+    ]
+
+
+def test_update_optimized_response(mutation, users, django_assert_num_queries):
+    group = models.Group.objects.create(name='group')
+    with django_assert_num_queries(5):
+        result = mutation('{ users: updateUsers(data: { groupId: %d }) { name group { name } } }' % group.pk)
+    assert not result.errors
+    assert result.data['users'] == [{ 'name': f'user{i+1}', 'group': { 'name': 'group' } } for i in range(3)]
+
 def test_delete(mutation, users):
     result = mutation('{ ids: deleteUsers(filters: ["id__gt=1"]) }')
     assert not result.errors
@@ -49,7 +67,7 @@ def test_delete(mutation, users):
     ]
 
 @pytest.mark.asyncio
-@pytest.mark.django_db(transaction=True)
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
 async def test_async(schema):
     result = await schema.execute('mutation { user: createUser(data: { name: "user1" }) { id name } }')
     assert not result.errors
@@ -1,6 +1,7 @@
 import pytest
 import strawberry
 import strawberry_django
+from django.db.models.signals import m2m_changed
 from .. import models
 
 def test_create_foreign_key(mutation, group):
@@ -44,3 +45,47 @@ def test_update_many_to_many(mutation, group, tag):
     result = mutation('{ updateGroups(data: { tagsSet: [1] }) { id } }')
     assert not result.errors
     assert list(group.tags.values_list('id', flat=True)) == [1]
+
+
+@pytest.fixture
+def groups(db):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(3)]
+    groups = [models.Group.objects.create(name=f'group{i+1}') for i in range(3)]
+    for group in groups:
+        group.tags.set(tags[:2])
+    return groups
+
+
+def tag_ids(groups):
+    return [list(group.tags.order_by('pk').values_list('id', flat=True)) for group in groups]
+
+
+def test_update_many_to_many_batch(mutation, groups, django_assert_num_queries):
+    # savepoint, primary keys, delete, insert, savepoint release and response
+    with django_assert_num_queries(6):
+        result = mutation('{ updateGroups(data: { tagsSet: [2, 3] }) { id } }')
+    assert not result.errors
+    assert tag_ids(groups) == [[2, 3], [2, 3], [2, 3]]
+
+    result = mutation('{ updateGroups(data: { tagsAdd: [1, 2], tagsRemove: [3] }, filters: ["id__lte=2"]) { id } }')
+    assert not result.errors
+    assert tag_ids(groups) == [[1, 2], [1, 2], [2, 3]]
+
+
+def test_m2m_changed_signals(mutation, groups, settings):
+    settings.STRAWBERRY_DJANGO = { 'M2M_CHANGED_SIGNALS': True }
+    received = []
+    def receiver(instance, action, pk_set, **kwargs):
+        received.append((instance.name, action, pk_set))
+    m2m_changed.connect(receiver, sender=models.Group.tags.through)
+    try:
+        result = mutation('{ updateGroups(data: { tagsSet: [2, 3] }, filters: ["id=1"]) { id } }')
+    finally:
+        m2m_changed.disconnect(receiver, sender=models.Group.tags.through)
+    assert not result.errors
+    assert received == [
+        ('group1', 'pre_remove', {1}),
+        ('group1', 'pre_add', {3}),
+        ('group1', 'post_remove', {1}),
+        ('group1', 'post_add', {3}),
+    ]
@@ -0,0 +1,138 @@
+from typing import Optional
+import pytest
+import strawberry
+import strawberry_django
+from strawberry_django import transactions
+from .. import models, types
+
+
+def generate_schema(**kwargs):
+    def hook(info, instance):
+        if instance.name == 'invalid':
+            raise ValueError('invalid user')
+
+    @strawberry.type
+    class Mutation:
+        create_users = strawberry_django.mutations.create_batch(models.User, types.User, types.UserInput,
+                post_save=hook, **kwargs)
+        delete_users = strawberry_django.mutations.delete(models.User, types.User, types.UserInput)
+
+        @strawberry_django.mutation
+        def fail(self) -> Optional[bool]:
+            raise ValueError('failed')
+
+        # foreign keys of sqlite are checked when the transaction is committed
+        @strawberry_django.mutation
+        def create_orphan(self) -> Optional[bool]:
+            models.User.objects.create(name='orphan', group_id=0)
+            return True
+    return strawberry.Schema(strawberry_django.queries(types.User), mutation=Mutation,
+            extensions=[strawberry_django.TransactionExtension])
+
+
+def test_mutation_rollback(db):
+    schema = generate_schema()
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user" }, { name: "invalid" }]) { id } }')
+    assert result.errors[0].message == 'invalid user'
+    assert not models.User.objects.exists()
+
+
+def test_autocommit(db, settings):
+    settings.STRAWBERRY_DJANGO = { 'MUTATION_TRANSACTION': None }
+    schema = generate_schema()
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user" }, { name: "invalid" }]) { id } }')
+    assert result.errors[0].message == 'invalid user'
+    assert models.User.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_commit_timings():
+    schema = generate_schema()
+    result = schema.execute_sync('''mutation {
+        a: createUsers(data: [{ name: "user1" }]) { id }
+        b: createUsers(data: [{ name: "user2" }]) { id }
+    }''')
+    assert not result.errors
+    commits = result.extensions['transactions']
+    assert [(commit['path'], commit['database']) for commit in commits] == [('a', 'default'), ('b', 'default')]
+    assert all(commit['duration'] >= commit['commitDuration'] >= 0 for commit in commits)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_operation_transaction(settings):
+    settings.STRAWBERRY_DJANGO = { 'MUTATION_TRANSACTION': 'operation' }
+    schema = generate_schema()
+    result = schema.execute_sync('''mutation {
+        a: createUsers(data: [{ name: "user" }]) { id }
+        fail
+        c: deleteUsers
+    }''')
+    assert [error.message for error in result.errors] == ['failed',
+            'Mutation was not executed because previous mutation of the operation failed']
+    assert not models.User.objects.exists()
+    assert result.extensions['transactions'] == []
+
+    # errors of non-null mutations stop the execution
+    result = schema.execute_sync('''mutation {
+        a: createUsers(data: [{ name: "user" }]) { id }
+        b: createUsers(data: [{ name: "invalid" }]) { id }
+    }''')
+    assert result.errors[0].message == 'invalid user'
+    assert result.data is None
+    assert not models.User.objects.exists()
+
+    result = schema.execute_sync('''mutation {
+        a: createUsers(data: [{ name: "user1" }]) { id }
+        b: createUsers(data: [{ name: "user2" }]) { id }
+    }''')
+    assert not result.errors
+    assert [commit['path'] for commit in result.extensions['transactions']] == [None]
+    assert models.User.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_operation_commit_error(settings):
+    settings.STRAWBERRY_DJANGO = { 'MUTATION_TRANSACTION': 'operation' }
+    schema = generate_schema()
+    result = schema.execute_sync('''mutation {
+        createOrphan
+        a: createUsers(data: [{ name: "user" }]) { id }
+        b: createUsers(data: [{ name: "user" }]) @skip(if: true) { id }
+    }''')
+    assert [error.path for error in result.errors] == [['a']]
+    assert 'FOREIGN KEY constraint failed' in result.errors[0].message
+    assert result.data is None
+    assert not models.User.objects.exists()
+    assert result.extensions['transactions'] == []
+    assert transactions._operation_using.get() is None
+    assert transactions._commit_hook.get() is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_transaction_options():
+    schema = generate_schema(synchronous_commit=False)
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user" }]) { id } }')
+    assert not result.errors
+
+    schema = generate_schema(synchronous_commit='never')
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user" }]) { id } }')
+    assert result.errors[0].message == 'Unknown synchronous_commit value never'
+
+    schema = generate_schema(isolation_level='serializable')
+    result = schema.execute_sync('mutation { createUsers(data: [{ name: "user" }]) { id } }')
+    assert result.errors[0].message == 'Isolation level of sqlite transaction can not be set'
+    assert models.User.objects.count() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_async(settings):
+    settings.STRAWBERRY_DJANGO = { 'MUTATION_TRANSACTION': 'operation' }
+    schema = generate_schema()
+    result = await schema.execute('''mutation {
+        a: createUsers(data: [{ name: "user1" }]) { id }
+        b: createUsers(data: [{ name: "user2" }]) { id }
+    }''')
+    assert not result.errors
+    # mutations are executed in their own transactions in async context
+    assert [commit['path'] for commit in result.extensions['transactions']] == ['a', 'b']
@@ -1,4 +1,9 @@
 import pytest
+import strawberry
+import strawberry_django
+from asgiref.sync import sync_to_async
+from strawberry_django import loaders, resolvers, utils
+from .. import models
 
 pytestmark = pytest.mark.asyncio
 
@@ -25,3 +30,75 @@ async def test_query(query, user, group, tag):
             }]
         }
     }]
+
+
+@pytest.fixture
+def hops(monkeypatch):
+    calls = []
+    def sync_to_async_(func, **kwargs):
+        calls.append(func)
+        return sync_to_async(func, **kwargs)
+    monkeypatch.setattr(resolvers, 'sync_to_async', sync_to_async_)
+    monkeypatch.setattr(loaders, 'sync_to_async', sync_to_async_)
+    return calls
+
+
+@strawberry_django.type(models.User, fields=['name'])
+class User:
+    @strawberry_django.field
+    def name_upper(root) -> str:
+        return root.name.upper()
+
+    @strawberry_django.field
+    def user_count(root) -> int:
+        return models.User.objects.count()
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_field_resolvers(user, hops):
+    schema = strawberry.Schema(query=strawberry_django.queries(User))
+    # custom field resolvers are called once in a thread
+    result = await schema.execute('{ users { nameUpper } }')
+    assert not result.errors
+    assert result.data['users'] == [{ 'nameUpper': 'USER' }]
+    assert len(hops) == 2
+
+    result = await schema.execute('{ users { userCount } }')
+    assert not result.errors
+    assert result.data['users'] == [{ 'userCount': 1 }]
+    assert len(hops) == 4
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_relation_field_resolvers(query, user, hops):
+    # generated relation field resolvers are called in the event loop
+    result = await query('{ users { group { name } } }')
+    assert not result.errors
+    assert result.data['users'] == [{ 'group': { 'name': 'group' } }]
+    assert len(hops) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_object_resolver(query, user, hops):
+    result = await query('{ user(id: %d) { name group { name } } }' % user.id)
+    assert not result.errors
+    assert result.data['user'] == { 'name': 'user', 'group': { 'name': 'group' } }
+    # django async orm is used when it is available
+    assert len(hops) == (0 if loaders.ASYNC_ORM else 1)
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_async_context_extension(user, monkeypatch):
+    schema = strawberry.Schema(query=strawberry_django.queries(User),
+            extensions=[strawberry_django.AsyncContextExtension])
+    detect_async = utils.detect_async
+    calls = []
+    def detect():
+        calls.append(1)
+        return detect_async()
+    monkeypatch.setattr(utils, 'detect_async', detect)
+    result = await schema.execute('{ users { name nameUpper } }')
+    assert not result.errors
+    assert result.data['users'] == [{ 'name': 'user', 'nameUpper': 'USER' }]
+    assert len(calls) == 1
+    assert utils._async_context.get() is None
@@ -0,0 +1,138 @@
+import pytest
+import strawberry
+import strawberry_django
+from .. import models, types
+
+
+@pytest.fixture
+def users(db):
+    group = models.Group.objects.create(name='group')
+    return [models.User.objects.create(name=f'user{i+1}', group=group) for i in range(5)]
+
+
+def test_connection(query, users, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = query('''{
+            usersConnection(first: 2) {
+                edges { cursor node { name group { name } } }
+                pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+            }
+        }''')
+    assert not result.errors
+    connection = result.data['usersConnection']
+    assert [edge['node'] for edge in connection['edges']] == [
+        { 'name': 'user1', 'group': { 'name': 'group' } },
+        { 'name': 'user2', 'group': { 'name': 'group' } },
+    ]
+    assert connection['pageInfo'] == {
+        'hasNextPage': True,
+        'hasPreviousPage': False,
+        'startCursor': connection['edges'][0]['cursor'],
+        'endCursor': connection['edges'][1]['cursor'],
+    }
+
+    result = query('''{
+        usersConnection(first: 3, after: "%s") {
+            edges { node { name } }
+            pageInfo { hasNextPage }
+        }
+    }''' % connection['pageInfo']['endCursor'])
+    assert not result.errors
+    connection = result.data['usersConnection']
+    assert [edge['node']['name'] for edge in connection['edges']] == ['user3', 'user4', 'user5']
+    assert connection['pageInfo'] == { 'hasNextPage': False }
+
+
+def test_backward_pagination(query, users):
+    result = query('''{
+        usersConnection(orderBy: ["-name"], last: 2) {
+            edges { node { name } }
+            pageInfo { hasNextPage hasPreviousPage }
+        }
+    }''')
+    assert not result.errors
+    connection = result.data['usersConnection']
+    assert [edge['node']['name'] for edge in connection['edges']] == ['user2', 'user1']
+    assert connection['pageInfo'] == { 'hasNextPage': False, 'hasPreviousPage': True }
+
+
+def test_total_count(query, users, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = query('{ usersConnection(first: 1, filters: ["name!=\'user1\'"]) { totalCount edges { node { name } } } }')
+    assert not result.errors
+    assert result.data['usersConnection'] == {
+        'totalCount': 4,
+        'edges': [{ 'node': { 'name': 'user2' } }],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_connection_async(schema, users):
+    result = await schema.execute('{ usersConnection(first: 1) { totalCount edges { node { name } } } }')
+    assert not result.errors
+    assert result.data['usersConnection'] == {
+        'totalCount': 5,
+        'edges': [{ 'node': { 'name': 'user1' } }],
+    }
+
+
+# null values are sorted after other values in both directions
+@pytest.mark.parametrize('order_by, expected', [
+    ('group', ['user2', 'user4', 'user1', 'user3', 'user5']),
+    ('-group', ['user1', 'user3', 'user5', 'user4', 'user2']),
+])
+def test_nullable_ordering(query, db, order_by, expected):
+    groups = [models.Group.objects.create(name=f'group{i+1}') for i in range(2)]
+    for i in range(5):
+        group = groups[i // 2] if i % 2 else None
+        models.User.objects.create(name=f'user{i+1}', group=group)
+
+    def page(arguments):
+        result = query('''{
+            usersConnection(orderBy: ["%s"], %s) {
+                edges { node { name } }
+                pageInfo { startCursor endCursor }
+            }
+        }''' % (order_by, arguments))
+        assert not result.errors
+        connection = result.data['usersConnection']
+        return [edge['node']['name'] for edge in connection['edges']], connection['pageInfo']
+
+    names, after, cursors = [], None, []
+    while len(names) < 5:
+        page_names, page_info = page('first: 1' + (f', after: "{after}"' if after else ''))
+        names += page_names
+        after = page_info['endCursor']
+        cursors.append(after)
+    assert names == expected
+    assert page(f'first: 1, after: "{after}"')[0] == []
+
+    for i in range(1, 5):
+        assert page(f'first: 2, after: "{cursors[i - 1]}"')[0] == expected[i:i + 2]
+        assert page(f'last: 2, before: "{cursors[i]}"')[0] == expected[max(i - 2, 0):i]
+
+
+def test_connection_fields_are_optional():
+    schema = strawberry.Schema(query=strawberry_django.queries(types.User))
+    assert 'usersConnection' not in schema._schema.query_type.fields
+    schema = strawberry.Schema(query=strawberry_django.queries(types.User, connection=True))
+    assert 'usersConnection' in schema._schema.query_type.fields
+
+
+# generated types of object types which have the same name are named uniquely
+def test_connection_type_names():
+    @strawberry_django.type(models.User, fields=['name'])
+    class User:
+        pass
+
+    @strawberry.type
+    class Query:
+        users = strawberry_django.queries.connection(types.User)
+        names = strawberry_django.queries.connection(User)
+    schema = strawberry.Schema(query=Query)
+    users_type = schema._schema.query_type.fields['users'].type.of_type
+    names_type = schema._schema.query_type.fields['names'].type.of_type
+    assert users_type.name.startswith('UserConnection')
+    assert names_type.name.startswith('UserConnection')
+    assert users_type.name != names_type.name
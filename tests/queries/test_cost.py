@@ -0,0 +1,87 @@
+import pytest
+import strawberry
+import strawberry_django
+from graphql import parse
+from strawberry_django import cost
+from .. import models, types
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(types.User, types.Group, types.Tag, connection=True)
+    return strawberry.Schema(query=Query, extensions=[strawberry_django.QueryCostExtension])
+
+
+@pytest.fixture
+def users(db):
+    group = models.Group.objects.create(name='group')
+    return [models.User.objects.create(name=f'user{i+1}', group=group) for i in range(5)]
+
+
+def get_cost(schema, query, variables=None):
+    document = parse(query)
+    fragments = { definition.name.value: definition for definition in document.definitions[1:] }
+    return cost.get_query_cost(schema._schema, document.definitions[0], fragments, variables)
+
+
+def test_query_cost(schema, settings):
+    settings.STRAWBERRY_DJANGO = { 'QUERY_COST_LIST_SIZE': 10, 'QUERY_COST_WEIGHTS': { 'Group': 5 } }
+    assert get_cost(schema, '{ user(id: 1) { name } }') == 1
+    assert get_cost(schema, '{ users { name } }') == 10
+    assert get_cost(schema, '{ users(limit: 3) { name group { name } } }') == 3 * (1 + 5)
+    assert get_cost(schema, 'query ($n: Int) { users(first: $n) { name } }', { 'n': 2 }) == 2
+    assert get_cost(schema, '{ groups(limit: 2) { users { name } } }') == 2 * (5 + 10)
+    assert get_cost(schema, '{ ...F } fragment F on Query { users(limit: 4) { name } }') == 4
+    # page size of a connection applies to edges of the connection
+    assert get_cost(schema, '{ usersConnection(first: 4) { edges { node { name } } } }') == 1 + 4 * 2
+
+    settings.STRAWBERRY_DJANGO = { 'MAX_PAGE_SIZE': 5 }
+    assert get_cost(schema, '{ users { name } }') == 5
+    assert get_cost(schema, '{ users(limit: 50) { name } }') == 5
+
+
+def test_max_cost(schema, users, settings, django_assert_num_queries):
+    settings.STRAWBERRY_DJANGO = { 'MAX_QUERY_COST': 20, 'QUERY_COST_LIST_SIZE': 10 }
+    with django_assert_num_queries(0):
+        result = schema.execute_sync('{ users { name group { name } } groups(limit: 1) { name } }')
+    assert result.errors[0].message == 'Query cost 21 exceeds maximum cost 20'
+
+    result = schema.execute_sync('{ users(limit: 10) { name group { name } } }')
+    assert not result.errors
+    assert result.extensions == { 'cost': { 'estimated': 20, 'rows': 10 } }
+
+
+def test_max_rows(schema, users, settings):
+    settings.STRAWBERRY_DJANGO = { 'MAX_ROWS': 5 }
+    result = schema.execute_sync('{ users { name } }')
+    assert not result.errors
+    result = schema.execute_sync('{ users { name group { name } } }')
+    assert result.errors[0].message == 'Query exceeds maximum number of rows 5'
+    assert result.data['users'][0] == { 'name': 'user1', 'group': None }
+
+
+# root lists fetch one row more than the remaining budget
+def test_max_rows_limits_fetched_rows(schema, users, settings, django_assert_num_queries):
+    settings.STRAWBERRY_DJANGO = { 'MAX_ROWS': 3 }
+    with django_assert_num_queries(1) as context:
+        result = schema.execute_sync('{ users { name } }')
+    assert 'LIMIT 4' in context.captured_queries[0]['sql']
+    assert result.errors[0].message == 'Query exceeds maximum number of rows 3'
+    assert result.extensions == { 'cost': { 'estimated': 100, 'rows': 4 } }
+
+    # group uses one row of the budget. page size is limited to the remaining
+    # budget and one row, and one more row is fetched for hasNextPage
+    with django_assert_num_queries(2) as context:
+        result = schema.execute_sync('{ group(id: %s) { name } usersConnection { edges { node { name } } } }'
+                % users[0].group_id)
+    assert 'LIMIT 4' in context.captured_queries[1]['sql']
+    assert result.errors[0].message == 'Query exceeds maximum number of rows 3'
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_async(schema, users, settings):
+    settings.STRAWBERRY_DJANGO = { 'MAX_ROWS': 4 }
+    result = await schema.execute('{ users { name } }')
+    assert result.errors[0].message == 'Query exceeds maximum number of rows 4'
+    assert result.data is None
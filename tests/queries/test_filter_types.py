@@ -0,0 +1,114 @@
+import pytest
+import strawberry
+import strawberry_django
+from django.db import models as django_models
+from django.db.models import Q
+from strawberry_django import filter_types
+from .. import models, types
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(types.User, types.Group, connection=True, where=True)
+    return strawberry.Schema(query=Query)
+
+
+@pytest.fixture
+def users(db):
+    group = models.Group.objects.create(name='group')
+    return [
+        models.User.objects.create(name='alice', group=group),
+        models.User.objects.create(name='bob', group=group),
+        models.User.objects.create(name='carol'),
+    ]
+
+
+def names(result, field='users'):
+    assert not result.errors
+    return [user['name'] for user in result.data[field]]
+
+
+def test_lookups(query, users):
+    assert names(query('{ users(where: { name: { exact: "bob" } }) { name } }')) == ['bob']
+    assert names(query('{ users(where: { name: { iStartsWith: "A" } }) { name } }')) == ['alice']
+    assert names(query('{ users(where: { name: { inList: ["alice", "carol"] } }) { name } }')) == ['alice', 'carol']
+    assert names(query('{ users(where: { group: { isNull: true } }) { name } }')) == ['carol']
+    result = query('{ users(where: { id: { range: ["%s", "%s"] } }) { name } }' % (users[1].pk, users[2].pk))
+    assert names(result) == ['bob', 'carol']
+
+
+def test_composition(query, users):
+    result = query('''{ users(where: {
+        OR: [{ name: { exact: "alice" } }, { name: { exact: "carol" } }],
+        NOT: { group: { isNull: true } }
+    }) { name } }''')
+    assert names(result) == ['alice']
+    result = query('''{ users(where: {
+        AND: [{ name: { contains: "o" } }, { name: { endsWith: "b" } }],
+    }) { name } }''')
+    assert names(result) == ['bob']
+
+
+def test_connection(query, users):
+    result = query('{ usersConnection(where: { name: { gt: "alice" } }) { edges { node { name } } } }')
+    assert not result.errors
+    assert [edge['node']['name'] for edge in result.data['usersConnection']['edges']] == ['bob', 'carol']
+
+
+def test_build_q():
+    UserFilter = filter_types.get_filter_type(models.User)
+    StringLookup = filter_types.get_lookup_type(str)
+    IDLookup = filter_types.get_lookup_type(strawberry.ID)
+    where = UserFilter(
+        name=StringLookup(i_contains='a'),
+        OR=[UserFilter(group=IDLookup(exact='1')), UserFilter(group=IDLookup(is_null=True))],
+    )
+    assert filter_types.build_q(where) == Q(name__icontains='a') & (Q(group__exact='1') | Q(group__isnull=True))
+
+
+def test_invalid_range(query, users):
+    result = query('{ users(where: { id: { range: ["1"] } }) { name } }')
+    assert result.errors[0].message == "Filter lookup 'range' of field 'id' requires two values"
+
+
+def test_restricted_fields(users):
+    @strawberry_django.filter(models.User, fields=['name'])
+    class UserFilter:
+        pass
+
+    assert [f.name for f in UserFilter._type_definition.fields] == ['name', 'AND', 'OR', 'NOT']
+    register = strawberry_django.TypeRegister()
+    register.register(UserFilter)
+    assert register.filters == { models.User: UserFilter }
+
+    Query = strawberry_django.queries(types.User, UserFilter)
+    schema = strawberry.Schema(query=Query)
+    result = schema.execute_sync('{ users(where: { name: { exact: "bob" } }) { name } }')
+    assert names(result) == ['bob']
+    result = schema.execute_sync('{ users(where: { id: { exact: "1" } }) { name } }')
+    assert result.errors
+
+
+def test_where_argument():
+    def arguments(Query):
+        return strawberry.Schema(query=Query)._schema.query_type.fields['users'].args
+    assert 'where' not in arguments(strawberry_django.queries(types.User))
+    assert 'where' in arguments(strawberry_django.queries(types.User, where=True))
+    UserFilter = filter_types.get_filter_type(models.User)
+    assert 'where' in arguments(strawberry_django.queries(types.User, UserFilter))
+    assert 'where' not in arguments(strawberry_django.queries(types.User, UserFilter, where=False))
+
+
+# filter types of models which have the same name are named uniquely
+def test_filter_type_names():
+    class Meta:
+        app_label = 'other'
+    User = type('User', (django_models.Model,), { '__module__': __name__, 'Meta': Meta })
+    filter_type = filter_types.get_filter_type(User)
+    assert filter_type._type_definition.name.startswith('UserFilter')
+    assert filter_type._type_definition.name != filter_types.get_filter_type(models.User)._type_definition.name
+
+
+def test_unsupported_field():
+    with pytest.raises(TypeError, match="Filtering by field 'tags' is not supported"):
+        strawberry_django.filter(models.Group, fields=['tags'])(type('GroupFilter', (), {}))
@@ -0,0 +1,60 @@
+import pytest
+import strawberry
+import strawberry_django
+from .. import models, types
+
+
+@strawberry_django.type(models.User, fields=['name', 'group'], types=types.types)
+class User:
+    @strawberry_django.field
+    def group_name(root) -> str:
+        return models.Group.objects.get(pk=root.group_id).name
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(User, types.Group)
+    return strawberry.Schema(query=Query, extensions=[strawberry_django.QueryInstrumentationExtension])
+
+
+@pytest.fixture
+def users(db):
+    groups = [models.Group.objects.create(name=f'group{i+1}') for i in range(3)]
+    return [models.User.objects.create(name=f'user{i+1}', group=group) for i, group in enumerate(groups)]
+
+
+def test_queries(schema, users):
+    result = schema.execute_sync('{ users { name group { name tags { name } } } }')
+    assert not result.errors
+    queries = result.extensions['queries']
+    assert queries['count'] == 2
+    assert [(resolver['path'], resolver['count']) for resolver in queries['resolvers']] == [
+        ('users', 2),
+    ]
+    assert queries['nPlusOne'] == []
+
+
+def test_n_plus_one(schema, users, settings):
+    settings.STRAWBERRY_DJANGO = { 'N_PLUS_ONE_THRESHOLD': 3 }
+    result = schema.execute_sync('{ users { groupName } }')
+    assert not result.errors
+    queries = result.extensions['queries']
+    assert [(resolver['path'], resolver['count']) for resolver in queries['resolvers']] == [
+        ('users', 1),
+        ('users.groupName', 3),
+    ]
+    assert [(query['path'], query['count']) for query in queries['nPlusOne']] == [('users.groupName', 3)]
+    assert queries['nPlusOne'][0]['sql'].startswith('SELECT')
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_async(schema, users):
+    result = await schema.execute('{ users { groupName } groups { name } }')
+    assert not result.errors
+    queries = result.extensions['queries']
+    assert sorted((resolver['path'], resolver['count']) for resolver in queries['resolvers']) == [
+        ('groups', 1),
+        ('users', 1),
+        ('users.groupName', 3),
+    ]
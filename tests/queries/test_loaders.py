@@ -0,0 +1,205 @@
+import pytest
+import strawberry
+import strawberry_django
+from typing import List
+from strawberry_django import loaders
+from .. import models, types
+
+
+@pytest.fixture
+def users(db):
+    return [
+        models.User.objects.create(name=f'user{i+1}',
+                group=models.Group.objects.create(name=f'group{i+1}'))
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def groups(db):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(3)]
+    groups = []
+    for i in range(3):
+        group = models.Group.objects.create(name=f'group{i+1}')
+        group.tags.set(tags[:i+1])
+        groups.append(group)
+    return groups
+
+
+@pytest.fixture
+def schema():
+    # custom resolvers are not optimized by the query optimizer
+    @strawberry.type
+    class Query:
+        @strawberry_django.field
+        def users(self) -> List[types.User]:
+            return models.User.objects.all()
+
+        @strawberry_django.field
+        def groups(self) -> List[types.Group]:
+            return models.Group.objects.all()
+    return strawberry.Schema(query=Query)
+
+
+@pytest.fixture
+def fetch_calls(monkeypatch):
+    calls = []
+    get_related_queryset = loaders.get_related_queryset
+    def fetch(field, values):
+        calls.append(sorted(values))
+        return get_related_queryset(field, values)
+    monkeypatch.setattr(loaders, 'get_related_queryset', fetch)
+    return calls
+
+
+def test_foreign_key(schema, users, fetch_calls, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = schema.execute_sync('{ users { name group { name } } }')
+    assert not result.errors
+    assert result.data['users'] == [
+        { 'name': 'user1', 'group': { 'name': 'group1' } },
+        { 'name': 'user2', 'group': { 'name': 'group2' } },
+        { 'name': 'user3', 'group': { 'name': 'group3' } },
+    ]
+    assert fetch_calls == [[user.group_id for user in users]]
+
+
+def test_null_foreign_key(schema, users, fetch_calls):
+    models.User.objects.filter(name='user2').update(group=None)
+    result = schema.execute_sync('{ users { group { name } } }')
+    assert not result.errors
+    assert result.data['users'] == [
+        { 'group': { 'name': 'group1' } },
+        { 'group': None },
+        { 'group': { 'name': 'group3' } },
+    ]
+    assert fetch_calls == [[users[0].group_id, users[2].group_id]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_foreign_key_async(schema, users, fetch_calls):
+    result = await schema.execute('{ users { name group { name } } }')
+    assert not result.errors
+    assert result.data['users'] == [
+        { 'name': 'user1', 'group': { 'name': 'group1' } },
+        { 'name': 'user2', 'group': { 'name': 'group2' } },
+        { 'name': 'user3', 'group': { 'name': 'group3' } },
+    ]
+    assert fetch_calls == [[user.group_id for user in users]]
+
+
+def test_many_to_many(schema, groups, django_assert_num_queries):
+    with django_assert_num_queries(3):
+        result = schema.execute_sync('''{
+            groups {
+                tags(orderBy: ["-name"]) { name }
+                filtered: tags(filters: ["name!='tag1'"]) { name }
+            }
+        }''')
+    assert not result.errors
+    assert result.data['groups'] == [
+        { 'tags': [{ 'name': 'tag1' }], 'filtered': [] },
+        { 'tags': [{ 'name': 'tag2' }, { 'name': 'tag1' }], 'filtered': [{ 'name': 'tag2' }] },
+        { 'tags': [{ 'name': 'tag3' }, { 'name': 'tag2' }, { 'name': 'tag1' }],
+          'filtered': [{ 'name': 'tag2' }, { 'name': 'tag3' }] },
+    ]
+
+
+def test_reverse_foreign_key(schema, users, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = schema.execute_sync('{ groups { name users { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [
+        { 'name': 'group1', 'users': [{ 'name': 'user1' }] },
+        { 'name': 'group2', 'users': [{ 'name': 'user2' }] },
+        { 'name': 'group3', 'users': [{ 'name': 'user3' }] },
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_many_to_many_async(schema, groups, monkeypatch):
+    calls = []
+    prefetch_many = loaders.prefetch_many
+    def prefetch(instances, *args):
+        calls.append(len(instances))
+        return prefetch_many(instances, *args)
+    monkeypatch.setattr(loaders, 'prefetch_many', prefetch)
+
+    result = await schema.execute('{ groups { tags { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [
+        { 'tags': [{ 'name': 'tag1' }] },
+        { 'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }] },
+        { 'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }, { 'name': 'tag3' }] },
+    ]
+    assert calls == [3]
+
+
+def test_identity_map(users, fetch_calls, settings, django_assert_num_queries):
+    @strawberry.type
+    class Query:
+        groups = strawberry_django.queries.list(types.Group)
+        group = strawberry_django.queries.get(types.Group)
+
+        @strawberry_django.field
+        def users(self) -> List[types.User]:
+            return models.User.objects.all()
+    schema = strawberry.Schema(query=Query)
+
+    query = '{ groups { name } users { group { name } } group(id: %s) { name } }' % users[0].group_id
+    with django_assert_num_queries(2):
+        result = schema.execute_sync(query)
+    assert not result.errors
+    assert [user['group'] for user in result.data['users']] == result.data['groups']
+    assert fetch_calls == []
+
+    settings.STRAWBERRY_DJANGO = { 'IDENTITY_MAP_SIZE': None }
+    with django_assert_num_queries(4):
+        result = schema.execute_sync(query)
+    assert not result.errors
+    assert fetch_calls == [[user.group_id for user in users]]
+
+
+
+# executions of the same parsed document do not share the identity map
+def test_identity_map_is_released(schema, users):
+    from graphql import execute, parse
+    document = parse('{ users { name group { name } } }')
+    result = execute(schema._schema, document)
+    assert not result.errors
+    assert result.data['users'][0]['group'] == { 'name': 'group1' }
+
+    models.Group.objects.filter(pk=users[0].group_id).update(name='changed')
+    result = execute(schema._schema, document)
+    assert not result.errors
+    assert result.data['users'][0]['group'] == { 'name': 'changed' }
+
+
+def test_identity_map_size():
+    identity_map = loaders.IdentityMap(2)
+    tags = [models.Tag(id=i+1, name=f'tag{i+1}') for i in range(3)]
+    identity_map.add(tags[:2])
+    assert identity_map.get(models.Tag, 1) is tags[0]
+    identity_map.add(tags[2:])
+    assert identity_map.get(models.Tag, 1) is tags[0]
+    assert identity_map.get(models.Tag, 2) is None
+    assert identity_map.get(models.Tag, 3) is tags[2]
+
+
+# attributes are numbered by the full arguments within the request
+def test_prefetch_attr():
+    class Info:
+        fragments = {}
+    info = Info()
+    attrs = [
+        loaders.get_prefetch_attr(info, 'tags', ["name='a'"], []),
+        loaders.get_prefetch_attr(info, 'tags', ["name='b'"], []),
+        loaders.get_prefetch_attr(info, 'tags', [], ['name']),
+        loaders.get_prefetch_attr(info, 'tags', [], [], { 'first': 1 }),
+        loaders.get_prefetch_attr(info, 'tags', [], [], { 'first': 2 }),
+    ]
+    assert len(set(attrs)) == len(attrs)
+    assert loaders.get_prefetch_attr(info, 'tags', ["name='b'"], []) == attrs[1]
+    assert loaders.get_prefetch_attr(Info(), 'tags', ["name='b'"], []) == attrs[1]
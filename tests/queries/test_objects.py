@@ -0,0 +1,131 @@
+import pytest
+import strawberry
+import strawberry_django
+from strawberry_django import loaders
+from .. import models, types
+
+
+@pytest.fixture
+def schema():
+    Query = strawberry_django.queries(types.User, types.Group, by_ids=True)
+    return strawberry.Schema(query=Query)
+
+
+@pytest.fixture
+def users(db):
+    return [
+        models.User.objects.create(name=f'user{i+1}',
+                group=models.Group.objects.create(name=f'group{i+1}'))
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def fetch_calls(monkeypatch):
+    calls = []
+    fetch_objects = loaders.fetch_objects
+    def fetch(qs, ids, *args):
+        calls.append(list(ids))
+        return fetch_objects(qs, ids, *args)
+    monkeypatch.setattr(loaders, 'fetch_objects', fetch)
+    return calls
+
+
+def test_aliased_objects(schema, users, fetch_calls, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = schema.execute_sync('''query ($id: ID!) {
+            a: user(id: %s) { name }
+            b: user(id: $id) { name group { name } }
+            c: user(id: %s) { name }
+        }''' % (users[0].pk, users[0].pk), variable_values={ 'id': users[2].pk })
+    assert not result.errors
+    assert result.data == {
+        'a': { 'name': 'user1' },
+        'b': { 'name': 'user3', 'group': { 'name': 'group3' } },
+        'c': { 'name': 'user1' },
+    }
+    assert fetch_calls == [[str(users[0].pk), str(users[2].pk)]]
+
+
+def test_object_not_found(query, users):
+    result = query('{ a: user(id: %s) { name } b: user(id: 0) { name } }' % users[0].pk)
+    assert result.errors[0].message == 'User matching query does not exist.'
+    assert result.errors[0].path == ['b']
+
+
+
+# loaded objects are not shared by executions of the same parsed document
+def test_objects_of_document_executed_again(schema, users):
+    from graphql import execute, parse
+    document = parse('{ a: user(id: %s) { name } b: user(id: %s) { name } }' % (users[0].pk, users[1].pk))
+    result = execute(schema._schema, document)
+    assert not result.errors
+    assert result.data == { 'a': { 'name': 'user1' }, 'b': { 'name': 'user2' } }
+
+    models.User.objects.filter(pk=users[0].pk).update(name='changed')
+    result = execute(schema._schema, document)
+    assert not result.errors
+    assert result.data == { 'a': { 'name': 'changed' }, 'b': { 'name': 'user2' } }
+
+
+def test_objects_by_ids_field_is_optional():
+    schema = strawberry.Schema(query=strawberry_django.queries(types.User))
+    assert 'usersByIds' not in schema._schema.query_type.fields
+
+def test_objects_by_ids(query, users, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = query('{ usersByIds(ids: ["%s", "0", "%s", "%s"]) { name group { name } } }'
+                % (users[2].pk, users[0].pk, users[2].pk))
+    assert not result.errors
+    assert result.data['usersByIds'] == [
+        { 'name': 'user3', 'group': { 'name': 'group3' } },
+        None,
+        { 'name': 'user1', 'group': { 'name': 'group1' } },
+        { 'name': 'user3', 'group': { 'name': 'group3' } },
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_async(schema, users, fetch_calls):
+    result = await schema.execute('''{
+        a: user(id: %s) { name }
+        b: user(id: %s) { name }
+        usersByIds(ids: ["%s", "0"]) { name }
+    }''' % (users[0].pk, users[1].pk, users[2].pk))
+    assert not result.errors
+    assert result.data == {
+        'a': { 'name': 'user1' },
+        'b': { 'name': 'user2' },
+        'usersByIds': [{ 'name': 'user3' }, None],
+    }
+    if not loaders.ASYNC_ORM:
+        assert sorted(fetch_calls) == [[str(users[0].pk), str(users[1].pk)], [str(users[2].pk), '0']]
+
+
+def test_invalid_id(query, users):
+    result = query('{ a: user(id: %s) { name } b: user(id: "abc") { name } }' % users[0].pk)
+    assert [(error.path, error.message) for error in result.errors] == [
+        (['b'], "Field 'id' expected a number but got 'abc'."),
+    ]
+    result = query('{ usersByIds(ids: ["abc", "%s"]) { name } }' % users[0].pk)
+    assert not result.errors
+    assert result.data['usersByIds'] == [None, { 'name': 'user1' }]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_invalid_id_async(schema, users):
+    result = await schema.execute('''{
+        a: user(id: %s) { name }
+        b: user(id: "abc") { name }
+    }''' % users[0].pk)
+    assert [(error.path, error.message) for error in result.errors] == [
+        (['b'], "Field 'id' expected a number but got 'abc'."),
+    ]
+    result = await schema.execute('''{
+        a: user(id: %s) { name }
+        usersByIds(ids: ["abc", "%s"]) { name }
+    }''' % (users[0].pk, users[1].pk))
+    assert not result.errors
+    assert result.data == { 'a': { 'name': 'user1' }, 'usersByIds': [None, { 'name': 'user2' }] }
@@ -0,0 +1,113 @@
+import pytest
+from .. import models
+
+
+@pytest.fixture
+def groups(db):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(3)]
+    groups = []
+    for i in range(3):
+        group = models.Group.objects.create(name=f'group{i+1}')
+        group.tags.set(tags[:i+1])
+        models.User.objects.create(name=f'user{i+1}', group=group, tag=tags[i])
+        groups.append(group)
+    return groups
+
+
+def test_select_related(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = query('{ users { name group { name } tag { name } } }')
+    assert not result.errors
+    assert result.data['users'][2] == {
+        'name': 'user3',
+        'group': { 'name': 'group3' },
+        'tag': { 'name': 'tag3' },
+    }
+
+
+def test_prefetch_related(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(3):
+        result = query('{ groups { name tags { name } users { name } } }')
+    assert not result.errors
+    assert result.data['groups'][1] == {
+        'name': 'group2',
+        'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }],
+        'users': [{ 'name': 'user2' }],
+    }
+
+
+def test_nested_relations(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = query('{ users { group { tags { name } } } }')
+    assert not result.errors
+    assert result.data['users'][1] == {
+        'group': { 'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }] },
+    }
+
+
+def test_prefetch_with_arguments(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(3):
+        result = query('''{
+            groups {
+                all: tags(orderBy: ["-name"]) { name }
+                filtered: tags(filters: ["name!='tag1'"]) { name }
+            }
+        }''')
+    assert not result.errors
+    assert result.data['groups'][1] == {
+        'all': [{ 'name': 'tag2' }, { 'name': 'tag1' }],
+        'filtered': [{ 'name': 'tag2' }],
+    }
+
+
+def test_fragments(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = query('''
+            query { groups { ...GroupFields } }
+            fragment GroupFields on Group { tags { name } }
+        ''')
+    assert not result.errors
+    assert result.data['groups'][0] == { 'tags': [{ 'name': 'tag1' }] }
+
+
+def test_object_resolver(query, groups, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        result = query('{ user(id: 2) { name group { name tags { name } } } }')
+    assert not result.errors
+    assert result.data['user'] == {
+        'name': 'user2',
+        'group': { 'name': 'group2', 'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }] },
+    }
+
+
+@pytest.fixture
+def only_fields(settings):
+    settings.STRAWBERRY_DJANGO = { 'OPTIMIZER_ONLY_FIELDS': True }
+
+
+def test_only_fields(query, groups, only_fields, django_assert_num_queries):
+    with django_assert_num_queries(1) as context:
+        result = query('{ users { name } }')
+    assert not result.errors
+    assert result.data['users'][0] == { 'name': 'user1' }
+    sql = context.captured_queries[0]['sql']
+    assert '"tests_user"."name"' in sql
+    assert '"tests_user"."tag_id"' not in sql
+
+
+def test_only_fields_with_relations(query, groups, only_fields, django_assert_num_queries):
+    with django_assert_num_queries(2) as context:
+        result = query('{ groups { name users { name } } }')
+    assert not result.errors
+    assert result.data['groups'][0] == { 'name': 'group1', 'users': [{ 'name': 'user1' }] }
+    sql = context.captured_queries[1]['sql']
+    assert '"tests_user"."group_id"' in sql
+    assert '"tests_user"."tag_id"' not in sql
+
+    with django_assert_num_queries(1) as context:
+        result = query('{ users { group { name } } }')
+    assert not result.errors
+    assert result.data['users'][0] == { 'group': { 'name': 'group1' } }
+    sql = context.captured_queries[0]['sql']
+    assert '"tests_user"."group_id"' in sql
+    assert '"tests_user"."name"' not in sql
@@ -0,0 +1,88 @@
+import pytest
+from strawberry_django import loaders, pagination
+from .. import models
+
+
+@pytest.fixture
+def users(db):
+    return [models.User.objects.create(name=f'user{i+1}') for i in range(5)]
+
+
+def cursor(user, ordering=['pk']):
+    return pagination.get_cursor(user, ordering)
+
+
+def names(result, field='users'):
+    assert not result.errors
+    return [user['name'] for user in result.data[field]]
+
+
+def test_offset_and_limit(query, users):
+    assert names(query('{ users(limit: 2) { name } }')) == ['user1', 'user2']
+    assert names(query('{ users(offset: 3) { name } }')) == ['user4', 'user5']
+    assert names(query('{ users(offset: 1, limit: 2) { name } }')) == ['user2', 'user3']
+
+
+def test_first_and_after(query, users):
+    assert names(query('{ users(first: 2) { name } }')) == ['user1', 'user2']
+    result = query('{ users(first: 2, after: "%s") { name } }' % cursor(users[1]))
+    assert names(result) == ['user3', 'user4']
+
+
+def test_last_and_before(query, users):
+    assert names(query('{ users(last: 2) { name } }')) == ['user4', 'user5']
+    result = query('{ users(last: 2, before: "%s") { name } }' % cursor(users[3]))
+    assert names(result) == ['user2', 'user3']
+
+
+def test_cursor_with_ordering(query, users):
+    models.User.objects.filter(name='user4').update(name='user2')
+    ordering = ['-name', 'pk']
+    result = query('{ users(orderBy: ["-name"], first: 3) { name } }')
+    assert names(result) == ['user5', 'user3', 'user2']
+
+    user = models.User.objects.get(pk=users[1].pk)
+    result = query('{ users(orderBy: ["-name"], after: "%s") { name } }' % cursor(user, ordering))
+    assert names(result) == ['user2', 'user1']
+
+
+def test_max_page_size(query, users, settings):
+    settings.STRAWBERRY_DJANGO = { 'MAX_PAGE_SIZE': 2 }
+    assert names(query('{ users { name } }')) == ['user1', 'user2']
+    assert names(query('{ users(first: 10) { name } }')) == ['user1', 'user2']
+    assert names(query('{ users(offset: 2, limit: 10) { name } }')) == ['user3', 'user4']
+
+
+def test_invalid_arguments(query, users):
+    result = query('{ users(first: 1, limit: 1) { name } }')
+    assert result.errors[0].message == 'Cursor and offset pagination cannot be used together'
+    result = query('{ users(first: -1) { name } }')
+    assert result.errors[0].message == 'Pagination argument "first" cannot be negative'
+    result = query('{ users(after: "invalid") { name } }')
+    assert result.errors[0].message == 'Invalid cursor'
+
+
+def test_relation_pagination(query, db, django_assert_num_queries):
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(3)]
+    for i in range(2):
+        models.Group.objects.create(name=f'group{i+1}').tags.set(tags)
+
+    # relations are paginated separately for each parent without sliced prefetch
+    with django_assert_num_queries(2 if loaders.SLICED_PREFETCH else 3):
+        result = query('{ groups { tags(first: 1, after: "%s") { name } } }' % cursor(tags[0]))
+    assert not result.errors
+    assert result.data['groups'] == [
+        { 'tags': [{ 'name': 'tag2' }] },
+        { 'tags': [{ 'name': 'tag2' }] },
+    ]
+
+
+def test_relation_max_page_size(query, db, settings, django_assert_num_queries):
+    settings.STRAWBERRY_DJANGO = { 'MAX_PAGE_SIZE': 2 }
+    tags = [models.Tag.objects.create(name=f'tag{i+1}') for i in range(3)]
+    models.Group.objects.create(name='group').tags.set(tags)
+
+    with django_assert_num_queries(2):
+        result = query('{ groups { tags { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [{ 'tags': [{ 'name': 'tag1' }, { 'name': 'tag2' }] }]
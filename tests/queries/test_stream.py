@@ -0,0 +1,54 @@
+import pytest
+import strawberry
+import strawberry_django
+from strawberry_django import loaders
+from .. import models, types
+
+
+@pytest.fixture
+def schema():
+    @strawberry.type
+    class Query:
+        groups = strawberry_django.queries.list(types.Group, stream=True, chunk_size=2)
+    return strawberry.Schema(query=Query)
+
+
+@pytest.fixture
+def groups(db):
+    tag = models.Tag.objects.create(name='tag')
+    groups = [models.Group.objects.create(name=f'group{i+1}') for i in range(5)]
+    for group in groups:
+        group.tags.add(tag)
+        models.User.objects.create(name=f'{group.name} user', group=group)
+    return groups
+
+
+def test_stream(schema, groups, django_assert_num_queries):
+    # rows are fetched with one query and relations are prefetched for each chunk
+    with django_assert_num_queries(4):
+        result = schema.execute_sync('{ groups { name tags { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [{ 'name': f'group{i+1}', 'tags': [{ 'name': 'tag' }] } for i in range(5)]
+
+
+def test_chunk_batches(groups):
+    qs = models.Group.objects.order_by('pk')
+    instances = list(loaders.iterate_chunks(qs, chunk_size=2))
+    assert instances == groups
+    assert [len(instance._strawberry_django_batch) for instance in instances] == [2, 2, 2, 2, 1]
+
+
+def test_stream_pagination(schema, groups):
+    result = schema.execute_sync('{ groups(offset: 1, limit: 3) { name users { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [
+        { 'name': f'group{i+1}', 'users': [{ 'name': f'group{i+1} user' }] } for i in range(1, 4)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_stream_async(schema, groups):
+    result = await schema.execute('{ groups { name tags { name } } }')
+    assert not result.errors
+    assert result.data['groups'] == [{ 'name': f'group{i+1}', 'tags': [{ 'name': 'tag' }] } for i in range(5)]
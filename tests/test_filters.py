@@ -0,0 +1,45 @@
+import pytest
+from django.db.models import Q
+from strawberry_django import filters
+from .models import Group, User
+
+
+def test_compile_filters():
+    filter, exclude = filters.compile_filters(User, ['id__gt=5', 'name="you"', 'name__contains!="me"'])
+    assert filter == Q(id__gt=5, name='you')
+    assert exclude == Q(name__contains='me')
+
+
+def test_cached_filters():
+    first = filters.compile_filters(User, ['group__tags__name__in=["a", "b"]'])
+    second = filters.compile_filters(User, ('group__tags__name__in=["a", "b"]',))
+    assert first is second
+
+
+@pytest.mark.parametrize('model, lookup', [
+    (User, 'pk'),
+    (User, 'name__icontains'),
+    (User, 'group'),
+    (User, 'group__in'),
+    (User, 'group__name__startswith'),
+    (User, 'group__tags__name'),
+    (User, 'tag__isnull'),
+    (Group, 'users__name'),
+])
+def test_valid_lookups(model, lookup):
+    filters.validate_lookup(model, lookup)
+
+
+def test_invalid_field():
+    with pytest.raises(ValueError, match="Django model 'User' has no field 'nmae'"):
+        filters.compile_filters(User, ['nmae="x"'])
+
+
+def test_invalid_lookup():
+    with pytest.raises(ValueError, match="Unsupported lookup 'containz' in filter 'group__name__containz'"):
+        filters.compile_filters(User, ['group__name__containz="x"'])
+
+
+def test_invalid_value():
+    with pytest.raises(ValueError, match='Invalid filter value'):
+        filters.compile_filters(User, ['name=x'])
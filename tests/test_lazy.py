@@ -0,0 +1,77 @@
+import pytest
+import strawberry
+import strawberry_django
+from strawberry_django.types import LazyTypeDefinition
+from . import models
+
+
+@pytest.fixture
+def types(settings):
+    settings.STRAWBERRY_DJANGO = { 'LAZY_TYPES': True }
+    types = strawberry_django.TypeRegister()
+
+    @types.register
+    @strawberry_django.type(models.User, types=types)
+    class User:
+        @strawberry_django.field
+        def name_upper(root) -> str:
+            return root.name.upper()
+
+    @types.register
+    @strawberry_django.type(models.Group, types=types)
+    class Group:
+        pass
+
+    @types.register
+    @strawberry_django.type(models.Tag, types=types)
+    class Tag:
+        pass
+
+    @types.register
+    @strawberry_django.input(models.User, types=types)
+    class UserInput:
+        pass
+
+    return types
+
+
+def is_lazy(cls):
+    return isinstance(cls._type_definition, LazyTypeDefinition)
+
+
+def test_lazy_types(types, db):
+    User, UserInput = types.get(models.User, False), types.get(models.User, True)
+    assert types.get(models.Group, False)
+    assert is_lazy(User) and is_lazy(UserInput)
+    assert 'name' not in getattr(User, '__annotations__', {})
+
+    Query = strawberry_django.queries(User, types=types, where=True)
+    Mutation = strawberry_django.mutations(User, types=types)
+    assert is_lazy(User) and is_lazy(UserInput)
+
+    schema = strawberry.Schema(query=Query, mutation=Mutation)
+    assert not is_lazy(User) and not is_lazy(UserInput)
+    assert 'name' in User.__annotations__
+
+    result = schema.execute_sync('mutation { createUser(data: { name: "user" }) { id } }')
+    assert not result.errors
+    result = schema.execute_sync('mutation { updateUsers(data: { name: "lazy" }) { name } }')
+    assert not result.errors
+    result = schema.execute_sync('{ users(where: { name: { exact: "lazy" } }) { nameUpper group { name } } }')
+    assert not result.errors
+    assert result.data['users'] == [{ 'nameUpper': 'LAZY', 'group': None }]
+
+
+def test_lazy_type_is_generated_on_first_use(types):
+    User = types.get(models.User, False)
+    assert User._type_definition.name == 'User'
+    assert is_lazy(User)
+    assert [field.name for field in User._type_definition.fields] == ['id', 'name', 'group', 'tag', 'nameUpper']
+    assert not is_lazy(User)
+
+
+def test_eager_types():
+    @strawberry_django.type(models.User, fields=['name'], lazy=False)
+    class User:
+        pass
+    assert not is_lazy(User)
@@ -1,5 +1,7 @@
 import strawberry
 import strawberry_django
+from strawberry_django.type import generate_update_from_input
+from . import types
 from .models import User
 
 def test_type_instance():
@@ -18,3 +20,14 @@ def test_input_instance():
     user = InputType(1, 'user')
     assert user.id == 1
     assert user.name == 'user'
+
+
+def test_generated_types_are_cached():
+    update_type = generate_update_from_input(User, types.UserInput)
+    assert update_type.__name__ == 'UserInputUpdate'
+    assert generate_update_from_input(User, types.UserInput) is update_type
+
+    assert strawberry_django.queries(types.User) is strawberry_django.queries(types.User)
+    assert strawberry_django.queries(types.User) is not strawberry_django.queries(types.User, types.Group)
+    assert strawberry_django.mutations(types.User, types=types.types) is strawberry_django.mutations(
+            User, types=types.types)
@@ -1,3 +1,4 @@
+import pytest
 from strawberry_django import utils
 
 def test_basic_filters():
@@ -9,3 +10,51 @@ def test_is_in_filter():
     filter, exclude = utils.process_filters(['id__in=[1, 2, 3]', 'group__in!=["a", "b", "x y z"]'])
     assert filter == { 'id__in': [1, 2, 3] }
     assert exclude == { 'group__in': ['a', 'b', 'x y z'] }
+
+def test_is_async():
+    assert not utils.is_async()
+    with utils.async_context(True):
+        assert utils.is_async()
+    assert not utils.is_async()
+
+@pytest.mark.asyncio
+async def test_is_async_in_event_loop():
+    assert utils.is_async()
+    with utils.async_context(False):
+        assert not utils.is_async()
+
+def test_chunk_params(monkeypatch):
+    from django.db import connection
+    monkeypatch.setattr(connection.features, 'max_query_params', 3)
+    assert utils.chunk_params([], 'default') == []
+    assert utils.chunk_params([1, 2, 3], 'default') == [[1, 2, 3]]
+    assert utils.chunk_params([1, 2, 3, 4, 5, 6, 7], 'default') == [[1, 2, 3], [4, 5, 6], [7]]
+    assert utils.chunk_params([1, 2, 3], 'default', reserved=1) == [[1, 2], [3]]
+    # chunks have at least one value even when all parameters are reserved
+    assert utils.chunk_params([1, 2], 'default', reserved=5) == [[1], [2]]
+    monkeypatch.setattr(connection.features, 'max_query_params', None)
+    assert utils.chunk_params(list(range(5000)), 'default') == [list(range(5000))]
+
+# state is not shared by executions of the same parsed document
+def test_request_state():
+    from graphql import execute, parse
+    import strawberry
+    states = []
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def a(self, info) -> int:
+            state = utils.get_request_state(info)
+            state['count'] = state.get('count', 0) + 1
+            states.append(state)
+            return state['count']
+
+        @strawberry.field
+        def b(self, info) -> int:
+            return utils.get_request_state(info)['count']
+    schema = strawberry.Schema(query=Query)
+    document = parse('{ a b }')
+    assert execute(schema._schema, document).data == { 'a': 1, 'b': 1 }
+    assert execute(schema._schema, document).data == { 'a': 1, 'b': 1 }
+    assert states[0] is not states[1]